@@ -1,5 +1,4 @@
 import os
-import json
 import re
 from typing import List, Dict, Any
 from pydantic import BaseModel, Field
@@ -7,7 +6,7 @@ from langchain_core.messages import HumanMessage
 from langgraph.prebuilt import create_react_agent
 from langgraph.checkpoint.memory import MemorySaver
 
-from src.utils import toon
+from src.utils import toon, fast_json
 from src.config.model_limits import get_agent_limit
 from src.config.model_config import get_model
 # --- Memory ---
@@ -103,14 +102,14 @@ def customer(query: str, model=None) -> str:
         # Parse JSON
         try:
             if isinstance(output_text, str):
-                parsed = json.loads(output_text)
+                parsed = fast_json.loads(output_text)
             else:
                 parsed = output_text
-            return json.dumps(parsed, indent=2)
+            return fast_json.dumps(parsed, indent=True)
         except Exception as e:
             print(f"Parsing error: {e}")
             # Return raw text if parsing fails, but wrapped in a structure
-            return json.dumps({"error": "Failed to parse JSON", "raw_output": output_text})
+            return fast_json.dumps({"error": "Failed to parse JSON", "raw_output": output_text})
 
     except Exception as e:
         raise ValueError(f"Customer agent failed: {e}")
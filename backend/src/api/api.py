@@ -143,6 +143,7 @@ async def classify(request: ClassifierRequest, x_user_api_key: Optional[str] = H
         raise HTTPException(status_code=500, detail=f"Error in classifier: {str(e)}")
 
 from src.services.diagram.diagram import generate_mermaid_link
+from src.utils import fast_json
 
 @app.post("/generate_product")
 async def generate_product(request: ProductRequest, x_user_api_key: Optional[str] = Header(default=None, alias="X-User-Api-Key")):
@@ -327,7 +328,7 @@ async def generate_summary(request: SummaryRequest, x_user_api_key: Optional[str
 async def generate_diagram(request: DiagramRequest, x_user_api_key: Optional[str] = Header(default=None, alias="X-User-Api-Key")):
     """Generate a Mermaid diagram from project summary"""
     try:
-        diagram_url = generate_mermaid_link(json.dumps(request.project_summary), api_key=x_user_api_key)
+        diagram_url = generate_mermaid_link(fast_json.dumps(request.project_summary), api_key=x_user_api_key)
         return {
             "diagram_url": diagram_url,
             "status": "success"
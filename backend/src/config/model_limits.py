@@ -23,6 +23,9 @@ AGENT_LIMITS: Dict[str, Any] = {
     },
     "summarizer": {
         "max_tokens": 3000
+    },
+    "global": {
+        "max_concurrent_llm": 5
     }
 }
 
@@ -1 +1 @@
-from .diagramAgent import generate_mermaid_link
+from .diagram import generate_mermaid_link
@@ -1,11 +1,26 @@
-import json
 import base64
+import logging
+import random
+import time
 import uuid
 import re
 from typing import Optional, Dict, Any
+import openai
 from langchain_core.messages import HumanMessage
 from src.config.model_config import get_model
 import src.utils.toon as toon
+from src.utils import fast_json
+
+logger = logging.getLogger(__name__)
+
+# Diagram type keywords accepted on the first line of Mermaid code
+VALID_DIAGRAM_STARTS = (
+    'graph', 'flowchart', 'sequenceDiagram', 'classDiagram',
+    'stateDiagram', 'erDiagram', 'gantt', 'pie', 'gitGraph'
+)
+
+# Upper bound on summary size sent to the model (~3K tokens at ~4 chars/token)
+MAX_SUMMARY_CHARS = 12_000
 
 def validate_mermaid_syntax(mermaid_code: str) -> bool:
     """
@@ -16,13 +31,8 @@ def validate_mermaid_syntax(mermaid_code: str) -> bool:
         return False
     
     # Check if it starts with a valid diagram type
-    valid_starts = [
-        'graph', 'flowchart', 'sequenceDiagram', 'classDiagram',
-        'stateDiagram', 'erDiagram', 'gantt', 'pie', 'gitGraph'
-    ]
-    
-    first_line = mermaid_code.strip().split('\n')[0].strip()
-    return any(first_line.startswith(start) for start in valid_starts)
+    first_line = mermaid_code.lstrip().partition('\n')[0].strip()
+    return first_line.startswith(VALID_DIAGRAM_STARTS)
 
 def clean_mermaid_code(code: str) -> str:
     """Clean and format Mermaid code for better readability."""
@@ -40,11 +50,86 @@ def clean_mermaid_code(code: str) -> str:
     
     return '\n'.join(lines)
 
+class _JsonObjectScanner:
+    """
+    Incrementally tracks brace depth over streamed text so we can stop
+    reading as soon as the first top-level JSON object is closed.
+    """
+    def __init__(self):
+        self.start = -1
+        self.end = -1
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self._offset = 0
+
+    def feed(self, text: str) -> bool:
+        """Consume the next chunk. Returns True once the object is complete."""
+        for i, ch in enumerate(text):
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == '\\':
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '{':
+                if self.start < 0:
+                    self.start = self._offset + i
+                self.depth += 1
+            elif self.start < 0:
+                continue
+            elif ch == '"':
+                self.in_string = True
+            elif ch == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    self.end = self._offset + i + 1
+                    return True
+        self._offset += len(text)
+        return False
+
+def _stream_json_response(model, messages) -> str:
+    """
+    Stream the model response and stop as soon as a complete JSON object
+    has arrived, skipping any trailing prose. Falls back to the full text
+    if no complete object is seen.
+    """
+    scanner = _JsonObjectScanner()
+    buf = []
+    stream = model.stream(messages)
+    try:
+        for chunk in stream:
+            text = chunk.content if isinstance(chunk.content, str) else ""
+            buf.append(text)
+            if scanner.feed(text):
+                content = ''.join(buf)
+                return content[scanner.start:scanner.end]
+    finally:
+        stream.close()
+    return ''.join(buf)
+
+def truncate_summary(summary: str, max_chars: int = MAX_SUMMARY_CHARS) -> str:
+    """
+    Keep oversized summaries within budget by dropping the middle.
+    The head and tail usually carry the project name and the most recent details.
+    """
+    if len(summary) <= max_chars:
+        return summary
+    half = max_chars // 2
+    logger.info("Truncating summary from %d to %d characters", len(summary), max_chars)
+    return summary[:half] + "\n...[truncated]...\n" + summary[-half:]
+
+def _backoff(attempt: int) -> None:
+    """Sleep with exponential backoff and jitter before the next retry."""
+    time.sleep(min(4.0, (2 ** attempt) * 0.5 + random.random() * 0.25))
+
 def generate_mermaid_direct(summary: str, max_retries: int = 2, api_key: Optional[str] = None) -> Optional[str]:
     """
     Generate Mermaid diagram using direct structured prompt with examples.
     This is more reliable than ReAct agents.
     """
+    summary = truncate_summary(summary)
     model = get_model(api_key=api_key)
     
     prompt = f"""You are a Mermaid diagram expert. Generate a clear, well-structured Mermaid flowchart diagram from this project summary.
@@ -89,15 +174,16 @@ INSTRUCTIONS:
 CRITICAL: Return ONLY the JSON object, nothing before or after it."""
 
     for attempt in range(max_retries):
+        if attempt:
+            _backoff(attempt - 1)
         try:
-            response = model.invoke([HumanMessage(content=prompt)])
-            content = response.content
+            content = _stream_json_response(model, [HumanMessage(content=prompt)])
             
             # Try to parse as JSON first
             try:
-                result = json.loads(content)
+                result = fast_json.loads(content)
                 diagram_code = result.get('diagram', '')
-            except json.JSONDecodeError:
+            except fast_json.JSONDecodeError:
                 # Try TOON format
                 parsed = toon.parse_response(content)
                 if parsed and 'diagram' in parsed:
@@ -108,25 +194,22 @@ CRITICAL: Return ONLY the JSON object, nothing before or after it."""
                     if match:
                         diagram_code = match.group(1)
                     else:
-                        print(f"Attempt {attempt + 1}: Could not parse response")
-                        if attempt < max_retries - 1:
-                            continue
-                        return None
+                        logger.debug("Attempt %d: could not parse response", attempt + 1)
+                        continue
             
             # Clean and validate
             diagram_code = clean_mermaid_code(diagram_code)
             
             if validate_mermaid_syntax(diagram_code):
                 return diagram_code
-            else:
-                print(f"Attempt {attempt + 1}: Invalid Mermaid syntax")
-                if attempt < max_retries - 1:
-                    continue
+            logger.debug("Attempt %d: invalid Mermaid syntax", attempt + 1)
                     
+        except (openai.AuthenticationError, openai.PermissionDeniedError) as e:
+            # Retrying cannot fix bad credentials
+            logger.error("Diagram generation not authorized: %s", e)
+            return None
         except Exception as e:
-            print(f"Attempt {attempt + 1} error: {e}")
-            if attempt < max_retries - 1:
-                continue
+            logger.warning("Attempt %d error: %s", attempt + 1, e)
     
     return None
 
@@ -208,36 +291,43 @@ def generate_mermaid_from_toon(toon_data: Dict[str, Any]) -> Optional[str]:
             return diagram_code
         
     except Exception as e:
-        print(f"Error in TOON-to-diagram conversion: {e}")
+        logger.warning("Error in TOON-to-diagram conversion: %s", e)
     
     return None
 
-def generate_mermaid_link(summary: str, api_key: Optional[str] = None) -> str:
+def generate_mermaid_link(summary: str, api_key: Optional[str] = None, use_agent: bool = False) -> str:
     """
     Generate a Mermaid diagram link from a project summary.
     Uses multiple approaches for reliability.
     
     Args:
         summary: Product summary as text or JSON string
+        api_key: Optional API key for the model
+        use_agent: Use the slower ReAct diagram agent instead of direct generation
     
     Returns:
         URL to the generated Mermaid diagram
     """
+    if use_agent:
+        from src.services.diagram.diagramAgent import generate_mermaid_link_via_agent
+        model = get_model(agent_type="diagram", api_key=api_key)
+        return generate_mermaid_link_via_agent(summary, open_in_browser=False, model=model)
+
     mermaid_code = None
     
     # Approach 1: Try direct structured generation (most reliable)
-    print("Attempting direct generation...")
+    logger.debug("Attempting direct generation...")
     mermaid_code = generate_mermaid_direct(summary, api_key=api_key)
     
     # Approach 2: If direct fails, try TOON conversion
     if not mermaid_code:
-        print("Direct generation failed, trying TOON conversion...")
+        logger.info("Direct generation failed, trying TOON conversion...")
         try:
             # Parse summary as JSON/TOON
             if isinstance(summary, str):
                 try:
-                    data = json.loads(summary)
-                except json.JSONDecodeError:
+                    data = fast_json.loads(summary)
+                except fast_json.JSONDecodeError:
                     data = toon.parse_response(summary)
             else:
                 data = summary
@@ -245,11 +335,11 @@ def generate_mermaid_link(summary: str, api_key: Optional[str] = None) -> str:
             if data:
                 mermaid_code = generate_mermaid_from_toon(data)
         except Exception as e:
-            print(f"TOON conversion error: {e}")
+            logger.warning("TOON conversion error: %s", e)
     
     # If both approaches fail, create a simple fallback
     if not mermaid_code:
-        print("Using fallback diagram...")
+        logger.info("Using fallback diagram...")
         mermaid_code = """flowchart TD
     A[Project] --> B[Features]
     A --> C[Components]
@@ -268,5 +358,5 @@ def generate_mermaid_link(summary: str, api_key: Optional[str] = None) -> str:
         
         return url
     except Exception as e:
-        print(f"Error encoding diagram: {e}")
+        logger.error("Error encoding diagram: %s", e)
         raise ValueError(f"Failed to generate diagram URL: {str(e)}")
@@ -1,15 +1,21 @@
-import json
 import base64
-import uuid
+import itertools
+import logging
 import webbrowser
 from langgraph.prebuilt import create_react_agent
 from langgraph.checkpoint.memory import MemorySaver
 from langchain_core.tools import tool
 from src.config.env import OPENAI_API_KEY
+from src.utils import fast_json
+
+logger = logging.getLogger(__name__)
 
 # --- Create memory ---
 memory = MemorySaver()
 
+# Thread IDs only need to be unique within this process because MemorySaver is in-memory
+_thread_counter = itertools.count()
+
 # --- Define visualization tool ---
 @tool
 def mermaid_visualizer(diagram_code: str) -> str:
@@ -76,9 +82,10 @@ try:
 except Exception:
     diagram_generator = None
 
-def generate_mermaid_link(summary: str, open_in_browser: bool = True, model=None) -> str:
+def generate_mermaid_link_via_agent(summary: str, open_in_browser: bool = True, model=None) -> str:
     """
-    Generate a Mermaid diagram link from a product summary.
+    Generate a Mermaid diagram link from a product summary using the ReAct agent.
+    Prefer diagram.generate_mermaid_link, which is faster and falls back more gracefully.
 
     Args:
         summary: Product summary as text or JSON string
@@ -97,7 +104,7 @@ def generate_mermaid_link(summary: str, open_in_browser: bool = True, model=None
     agent = get_diagram_generator_agent(model)
 
     # Create a unique thread ID for this session
-    thread_id = str(uuid.uuid4())
+    thread_id = f"diagram-{next(_thread_counter)}"
     config = {"configurable": {"thread_id": thread_id}}
 
     # Invoke the diagram generator with the summary
@@ -111,7 +118,7 @@ def generate_mermaid_link(summary: str, open_in_browser: bool = True, model=None
         # Get the last message content
         last_message = response['messages'][-1]
         # Try to parse as JSON
-        result = json.loads(last_message.content)
+        result = fast_json.loads(last_message.content)
         mermaid_code = result.get('diagram', '')
 
         if not mermaid_code:
@@ -127,32 +134,29 @@ def generate_mermaid_link(summary: str, open_in_browser: bool = True, model=None
 
         # Optionally open in browser
         if open_in_browser:
-            print("▶️  Opening diagram in your web browser...")
+            logger.info("Opening diagram in your web browser...")
             webbrowser.open(url)
-            print("✅ Done!")
 
         # Print explanation if available
         explanation = result.get('explanation', '')
         if explanation:
-            print("\nDiagram Explanation:")
-            print(explanation)
+            logger.info("Diagram explanation: %s", explanation)
 
         # Print feedback question if not done
         if not result.get('done', False):
             feedback_question = result.get('feedback_question', '')
             if feedback_question:
-                print("\nFeedback Question:")
-                print(feedback_question)
+                logger.info("Feedback question: %s", feedback_question)
 
         return url
 
-    except json.JSONDecodeError:
+    except fast_json.JSONDecodeError:
         # Handle case where response isn't JSON
-        print("Response wasn't in JSON format. Raw content:")
-        print(last_message.content)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response wasn't in JSON format. Raw content: %r", last_message.content)
         raise ValueError("Failed to parse diagram generator response")
     except Exception as e:
-        print(f"Error generating diagram: {str(e)}")
+        logger.error("Error generating diagram: %s", e)
         raise
 
 # Example usage:
@@ -160,7 +164,7 @@ if __name__ == "__main__":
     # Example with text summary
     text_summary = "A fitness tracking app with user profiles, workout logging, and progress charts"
     print("Generating diagram from text summary...")
-    diagram_url = generate_mermaid_link(text_summary)
+    diagram_url = generate_mermaid_link_via_agent(text_summary)
     print(f"Diagram URL: {diagram_url}")
 
     # Example with JSON
@@ -172,5 +176,5 @@ if __name__ == "__main__":
     }
     """
     print("\nGenerating diagram from JSON...")
-    diagram_url = generate_mermaid_link(product_json)
+    diagram_url = generate_mermaid_link_via_agent(product_json)
     print(f"Diagram URL: {diagram_url}")
@@ -5,7 +5,7 @@ import tempfile
 import subprocess
 import shutil
 import math
-from typing import List
+from typing import List, Optional
 from pathlib import Path
 import requests
 import pygame
@@ -118,14 +118,17 @@ def chunk_text_by_tokens(text: str, max_tokens: int) -> List[str]:
 
 # ----------------- TTS + rate-limited synth -----------------
 class TextToSpeech:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, session: Optional[requests.Session] = None):
         self.api_key = api_key
+        # Reuse the caller's session so repeated requests keep their connection open
+        self.session = session or requests.Session()
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
         try:
-            pygame.mixer.init()
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
         except Exception as e:
             print(f"Warning: pygame mixer init failed: {e}")
 
@@ -143,7 +146,7 @@ class TextToSpeech:
         }
 
         print(f"Sending TTS request with ~{estimated_tokens} tokens...")
-        resp = requests.post(
+        resp = self.session.post(
             "https://api.groq.com/openai/v1/audio/speech",
             headers=self.headers,
             json=data,
@@ -2,7 +2,7 @@ from langgraph.prebuilt import create_react_agent
 from langgraph.checkpoint.memory import MemorySaver
 from langchain_core.tools import tool
 from src.config.env import OPENAI_API_KEY
-import json
+from src.utils import fast_json
 
 # --- Create memory ---
 memory = MemorySaver()
@@ -85,7 +85,7 @@ if __name__ == "__main__":
     last_message = response['messages'][-1]
     try:
         # Parse JSON response
-        result = json.loads(last_message.content)
+        result = fast_json.loads(last_message.content)
 
         # Print results
         print("Converted Text for TTS:")
@@ -98,7 +98,7 @@ if __name__ == "__main__":
             f.write(result.get("converted_text", ""))
         print("\nConverted text saved to 'tts_ready_text.txt'")
 
-    except json.JSONDecodeError:
+    except fast_json.JSONDecodeError:
         # Fallback if response isn't valid JSON
         print("Error: Agent returned an invalid response format")
         print("Raw response:")
@@ -4,44 +4,91 @@ A PyQt5-based GUI application for processing product information through convers
 """
 
 import sys
-import json
 import os
-import webbrowser
-from datetime import datetime
-from typing import Dict, Any, Optional
-from queue import Queue
+import textwrap
+import time
+from collections import deque
+from contextlib import contextmanager
 
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QLabel, QLineEdit, QPushButton, QTextEdit, QFileDialog,
-                             QProgressBar, QMessageBox, QTabWidget, QGroupBox, QScrollArea,
-                             QInputDialog, QCheckBox, QSplitter, QFrame, QGridLayout)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize, QTimer, QDateTime
-from PyQt5.QtGui import QFont, QPixmap, QImage, QPalette, QColor
-import pygame
+                             QProgressBar, QMessageBox, QTabWidget, QGroupBox,
+                             QInputDialog, QCheckBox, QSplitter, QGridLayout)
+from PyQt5.QtCore import (Qt, QObject, QRunnable, QThreadPool, pyqtSignal, QTimer,
+                          QMutex, QWaitCondition, QUrl, QSettings)
+from PyQt5.QtGui import QFont, QTextCursor, QDesktopServices
+from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
 
 # Import your existing classes
 from src.ui.controller import ProductConversationManager
+from src.utils import fast_json
 
 
-class WorkerThread(QThread):
+def append_plain_text(text_edit: QTextEdit, *lines: str):
     """
-    Worker thread to run the workflow without freezing the UI.
+    Append lines to a QTextEdit as plain text.
+    All lines go in under one edit block so the document relayouts once.
+    """
+    cursor = text_edit.textCursor()
+    cursor.movePosition(QTextCursor.End)
+    cursor.beginEditBlock()
+    for line in lines:
+        cursor.insertText(line + "\n")
+    cursor.endEditBlock()
+    text_edit.setTextCursor(cursor)
+
+
+class HandoffQueue:
+    """
+    Blocking single-producer/single-consumer queue used to hand user answers
+    from the UI thread to the worker thread.
+    """
+
+    def __init__(self):
+        self._items = deque()
+        self._mutex = QMutex()
+        self._not_empty = QWaitCondition()
+
+    def put(self, item):
+        """Append an item and wake the waiting consumer."""
+        self._mutex.lock()
+        try:
+            self._items.append(item)
+            self._not_empty.wakeOne()
+        finally:
+            self._mutex.unlock()
+
+    def get(self):
+        """Block until an item is available and return it."""
+        self._mutex.lock()
+        try:
+            while not self._items:
+                self._not_empty.wait(self._mutex)
+            return self._items.popleft()
+        finally:
+            self._mutex.unlock()
+
+
+class Worker(QObject):
+    """
+    Worker that runs the workflow without freezing the UI.
     Handles background processing and communicates with the UI via signals.
     """
     finished = pyqtSignal(dict)
     progress = pyqtSignal(str)
     user_input_required = pyqtSignal(str)
     clarifier_question = pyqtSignal(str)
+    summary_chunk = pyqtSignal(str)
 
     def __init__(self, manager: ProductConversationManager, generate_audio: bool = True):
         super().__init__()
         self.manager = manager
         self.generate_audio = generate_audio
-        self.answer_queue = Queue()
-        self.clarifier_response_queue = Queue()
+        self.answer_queue = HandoffQueue()
+        self.clarifier_response_queue = HandoffQueue()
 
     def run(self):
-        """Execute the workflow in the background thread."""
+        """Execute the workflow. Called on a thread pool thread."""
         try:
             self.progress.emit("Starting workflow...")
 
@@ -57,93 +104,119 @@ class WorkerThread(QThread):
             def progress_callback(message):
                 self.progress.emit(message)
 
+            def summary_callback(chunk):
+                self.summary_chunk.emit(chunk)
+
             # Run the workflow with callbacks
             result = self.manager.run_full_workflow(
                 user_input_callback=user_input_callback,
                 clarifier_callback=clarifier_callback,
                 generate_audio=self.generate_audio,
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                summary_callback=summary_callback
             )
 
-            self.finished.emit(result)
+            self.finished.emit({"result": result, "json_str": self._serialize(result)})
 
         except Exception as e:
             self.progress.emit(f"Error: {str(e)}")
-            self.finished.emit({"error": str(e)})
+            self.finished.emit({"result": {"error": str(e)}, "json_str": ""})
+
+    @staticmethod
+    def _serialize(result):
+        """Pretty-print the result here so the UI thread doesn't have to."""
+        try:
+            return fast_json.dumps(result, indent=True)
+        except Exception as e:
+            return f"Error displaying JSON: {str(e)}"
+
+
+class WorkerRunnable(QRunnable):
+    """Runs a Worker on a QThreadPool thread so OS threads are reused across runs."""
+
+    def __init__(self, worker: Worker):
+        super().__init__()
+        self.worker = worker
+
+    def run(self):
+        self.worker.run()
+
+
+_STYLE = textwrap.dedent("""
+    QWidget {
+        background-color: #f5f5f5;
+        color: #333333;
+        font-family: 'Segoe UI', Arial, sans-serif;
+        font-size: 12px;
+    }
+    QGroupBox {
+        font-weight: bold;
+        border: 1px solid #cccccc;
+        border-radius: 6px;
+        margin-top: 10px;
+        padding-top: 10px;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px 0 5px;
+    }
+    QLineEdit, QTextEdit {
+        border: 1px solid #cccccc;
+        border-radius: 4px;
+        padding: 5px;
+        background-color: white;
+    }
+    QPushButton {
+        background-color: #4a86e8;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 6px 12px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #3a76d8;
+    }
+    QPushButton:pressed {
+        background-color: #2a66c8;
+    }
+    QPushButton:disabled {
+        background-color: #cccccc;
+        color: #666666;
+    }
+    QTabWidget::pane {
+        border: 1px solid #cccccc;
+        background-color: white;
+        border-radius: 4px;
+    }
+    QTabBar::tab {
+        background-color: #e1e1e1;
+        border: 1px solid #cccccc;
+        padding: 6px 12px;
+        margin-right: 2px;
+    }
+    QTabBar::tab:selected {
+        background-color: white;
+        border-bottom-color: white;
+    }
+    QProgressBar {
+        border: 1px solid #cccccc;
+        border-radius: 4px;
+        text-align: center;
+        background-color: #f0f0f0;
+    }
+    QProgressBar::chunk {
+        background-color: #4a86e8;
+    }
+""").strip()
 
 
 class StyledWidget(QWidget):
-    """Base widget with consistent styling."""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #f5f5f5;
-                color: #333333;
-                font-family: 'Segoe UI', Arial, sans-serif;
-                font-size: 12px;
-            }
-            QGroupBox {
-                font-weight: bold;
-                border: 1px solid #cccccc;
-                border-radius: 6px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-            QLineEdit, QTextEdit {
-                border: 1px solid #cccccc;
-                border-radius: 4px;
-                padding: 5px;
-                background-color: white;
-            }
-            QPushButton {
-                background-color: #4a86e8;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #3a76d8;
-            }
-            QPushButton:pressed {
-                background-color: #2a66c8;
-            }
-            QPushButton:disabled {
-                background-color: #cccccc;
-                color: #666666;
-            }
-            QTabWidget::pane {
-                border: 1px solid #cccccc;
-                background-color: white;
-                border-radius: 4px;
-            }
-            QTabBar::tab {
-                background-color: #e1e1e1;
-                border: 1px solid #cccccc;
-                padding: 6px 12px;
-                margin-right: 2px;
-            }
-            QTabBar::tab:selected {
-                background-color: white;
-                border-bottom-color: white;
-            }
-            QProgressBar {
-                border: 1px solid #cccccc;
-                border-radius: 4px;
-                text-align: center;
-                background-color: #f0f0f0;
-            }
-            QProgressBar::chunk {
-                background-color: #4a86e8;
-            }
-        """)
+    """
+    Base widget with consistent styling.
+    The _STYLE stylesheet is applied once to the QApplication rather than per instance.
+    """
 
 
 class ProductConversationGUI(QMainWindow):
@@ -156,6 +229,20 @@ class ProductConversationGUI(QMainWindow):
         super().__init__()
         self.manager = ProductConversationManager()
         self.worker = None
+        self._player = None
+        # Tabs built on first visit; see _materialize_tab
+        self.log_tab = None
+        self.diagram_tab = None
+        self.tts_tab = None
+        self.json_tab = None
+        self._pending_setups = {}
+        # Authoritative copy of this run's log lines for export; log_display
+        # only renders them and keeps the last 1000
+        self._log_records = deque(maxlen=5000)
+        # Start the file dialogs where the user last picked a file
+        self._settings = QSettings("app", "PCM")
+        self._last_image_dir = self._settings.value("last_image_dir", "", type=str)
+        self._last_audio_dir = self._settings.value("last_audio_dir", "", type=str)
         self.tab_switch_timer = QTimer(self)
         self.tab_switch_timer.timeout.connect(self.switch_to_summary_tab)
         self.initUI()
@@ -255,7 +342,8 @@ class ProductConversationGUI(QMainWindow):
 
         # Progress bar
         self.progress_bar = QProgressBar()
-        self.progress_bar.setRange(0, 0)  # Indeterminate progress
+        # Only indeterminate while a run is active; a hidden busy bar keeps animating
+        self.progress_bar.setRange(0, 100)
         self.progress_bar.setVisible(False)
         self.progress_bar.setMinimumHeight(20)
         input_layout.addWidget(self.progress_bar)
@@ -271,13 +359,17 @@ class ProductConversationGUI(QMainWindow):
         self.results_tabs = QTabWidget()
         self.results_tabs.setMinimumHeight(400)
 
-        # Setup all tabs
+        # Build the tabs shown first; the rest get placeholders and are
+        # built on first visit (or when results need them)
         self.setup_clarifier_tab()
         self.setup_summary_tab()
-        self.setup_log_tab()
-        self.setup_diagram_tab()
-        self.setup_tts_tab()
-        self.setup_json_tab()
+        for setup, title in ((self.setup_log_tab, "Logs"),
+                             (self.setup_diagram_tab, "Diagram"),
+                             (self.setup_tts_tab, "Audio"),
+                             (self.setup_json_tab, "Full JSON")):
+            index = self.results_tabs.addTab(StyledWidget(), title)
+            self._pending_setups[index] = setup
+        self.results_tabs.currentChanged.connect(self._materialize_tab)
 
         results_layout.addWidget(self.results_tabs)
         splitter.addWidget(results_widget)
@@ -290,6 +382,21 @@ class ProductConversationGUI(QMainWindow):
         self.status_bar = self.statusBar()
         self.status_bar.showMessage("Ready")
 
+        # Log lines are buffered and flushed together so the log view
+        # relayouts once per batch instead of once per message
+        self._log_buffer = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self.flush_log_buffer)
+
+        # Progress messages update the status bar at most every 100 ms
+        self._pending_status = None
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(100)
+        self._status_timer.timeout.connect(self.flush_pending_status)
+
     def setup_clarifier_tab(self):
         """Setup the clarifier conversation tab."""
         self.clarifier_tab = StyledWidget()
@@ -302,6 +409,8 @@ class ProductConversationGUI(QMainWindow):
 
         self.clarifier_display = QTextEdit()
         self.clarifier_display.setReadOnly(True)
+        self.clarifier_display.setAcceptRichText(False)
+        self.clarifier_display.setUndoRedoEnabled(False)
         self.clarifier_display.setMinimumHeight(200)
         clarifier_layout.addWidget(self.clarifier_display)
 
@@ -331,6 +440,8 @@ class ProductConversationGUI(QMainWindow):
 
         self.summary_text = QTextEdit()
         self.summary_text.setReadOnly(True)
+        self.summary_text.setAcceptRichText(False)
+        self.summary_text.setUndoRedoEnabled(False)
         summary_layout.addWidget(self.summary_text)
 
         self.results_tabs.addTab(self.summary_tab, "Summary")
@@ -347,9 +458,18 @@ class ProductConversationGUI(QMainWindow):
 
         self.log_display = QTextEdit()
         self.log_display.setReadOnly(True)
+        self.log_display.setAcceptRichText(False)
+        self.log_display.setUndoRedoEnabled(False)
+        # Drop the oldest lines so long runs don't grow the document unbounded
+        self.log_display.document().setMaximumBlockCount(1000)
         log_layout.addWidget(self.log_display)
 
-        self.results_tabs.addTab(self.log_tab, "Logs")
+        self.save_logs_btn = QPushButton("Save Logs")
+        self.save_logs_btn.clicked.connect(self.save_logs)
+        self.save_logs_btn.setMaximumHeight(36)
+        log_layout.addWidget(self.save_logs_btn)
+
+        return self.log_tab
 
     def setup_diagram_tab(self):
         """Setup the diagram results tab."""
@@ -377,7 +497,7 @@ class ProductConversationGUI(QMainWindow):
         diagram_layout.addLayout(diagram_info_layout)
         diagram_layout.addStretch()
 
-        self.results_tabs.addTab(self.diagram_tab, "Diagram")
+        return self.diagram_tab
 
     def setup_tts_tab(self):
         """Setup the text-to-speech results tab."""
@@ -401,7 +521,7 @@ class ProductConversationGUI(QMainWindow):
         tts_layout.addWidget(self.play_tts_btn)
 
         tts_layout.addStretch()
-        self.results_tabs.addTab(self.tts_tab, "Audio")
+        return self.tts_tab
 
     def setup_json_tab(self):
         """Setup the JSON results tab."""
@@ -415,23 +535,62 @@ class ProductConversationGUI(QMainWindow):
 
         self.json_text = QTextEdit()
         self.json_text.setReadOnly(True)
+        self.json_text.setAcceptRichText(False)
+        self.json_text.setUndoRedoEnabled(False)
         self.json_text.setFont(QFont("Consolas", 10))
         json_layout.addWidget(self.json_text)
 
-        self.results_tabs.addTab(self.json_tab, "Full JSON")
+        return self.json_tab
+
+    @contextmanager
+    def _batch_updates(self):
+        """Suspend repaints so a group of widget changes is painted once."""
+        self.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def _materialize_tab(self, index):
+        """Replace a placeholder tab with its real contents the first time it is needed."""
+        setup = self._pending_setups.pop(index, None)
+        if setup is None:
+            return
+
+        current = self.results_tabs.currentIndex()
+        placeholder = self.results_tabs.widget(index)
+        title = self.results_tabs.tabText(index)
+        tab = setup()
+
+        self.results_tabs.blockSignals(True)
+        try:
+            self.results_tabs.removeTab(index)
+            self.results_tabs.insertTab(index, tab, title)
+            self.results_tabs.setCurrentIndex(current)
+        finally:
+            self.results_tabs.blockSignals(False)
+        placeholder.deleteLater()
+
+    def _ensure_tab(self, setup):
+        """Build the tab created by ``setup`` if it is still a placeholder."""
+        for index, pending in list(self._pending_setups.items()):
+            if pending == setup:
+                self._materialize_tab(index)
 
     def browse_image(self):
         """Open file dialog to select an image."""
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "Select Image", "", "Image Files (*.png *.jpg *.jpeg *.bmp)")
+            self, "Select Image", self._last_image_dir, "Image Files (*.png *.jpg *.jpeg *.bmp)")
         if file_path:
+            self._last_image_dir = os.path.dirname(file_path)
             self.image_path.setText(file_path)
 
     def browse_audio(self):
         """Open file dialog to select an audio file."""
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "Select Audio", "", "Audio Files (*.mp3 *.wav *.ogg)")
+            self, "Select Audio", self._last_audio_dir, "Audio Files (*.mp3 *.wav *.ogg)")
         if file_path:
+            self._last_audio_dir = os.path.dirname(file_path)
             self.audio_path.setText(file_path)
         else:
             self.audio_path.setText("RECORD")
@@ -451,77 +610,122 @@ class ProductConversationGUI(QMainWindow):
             return
 
         # Update manager with inputs
-        self.manager = ProductConversationManager(
+        self.manager.update_inputs(
             text_input=text_input,
             image_input=image_input if image_input else None,
             audio_input=audio_input if audio_input else None
         )
 
         # Show progress bar
+        self.progress_bar.setRange(0, 0)  # Indeterminate progress
         self.progress_bar.setVisible(True)
         self.run_btn.setEnabled(False)
-        self.status_bar.showMessage("Running workflow...")
+        self.show_status("Running workflow...")
 
         # Clear previous results
         self.clear_all_results()
 
-        # Create and start worker thread
-        self.worker = WorkerThread(self.manager, generate_audio)
-        self.worker.finished.connect(self.workflow_finished)
-        self.worker.progress.connect(self.update_progress)
-        self.worker.user_input_required.connect(self.get_user_input)
-        self.worker.clarifier_question.connect(self.show_clarifier_question)
-        self.worker.start()
+        # Create the worker and run it on the shared thread pool
+        self.worker = Worker(self.manager, generate_audio)
+        # Signals are always emitted from the pool thread, so queue them explicitly
+        self.worker.finished.connect(self.workflow_finished, Qt.QueuedConnection)
+        self.worker.progress.connect(self.update_progress, Qt.QueuedConnection)
+        self.worker.user_input_required.connect(self.get_user_input, Qt.QueuedConnection)
+        self.worker.clarifier_question.connect(self.show_clarifier_question, Qt.QueuedConnection)
+        self.worker.summary_chunk.connect(self.append_summary_chunk, Qt.QueuedConnection)
+        QThreadPool.globalInstance().start(WorkerRunnable(self.worker))
 
     def clear_all_results(self):
         """Clear all previous results from the tabs."""
-        self.clarifier_display.clear()
-        self.clarifier_response.clear()
-        self.send_response_btn.setEnabled(False)
+        with self._batch_updates():
+            self.clarifier_display.clear()
+            self.clarifier_response.clear()
+            self.send_response_btn.setEnabled(False)
 
-        self.summary_text.clear()
+            self.summary_text.clear()
 
-        self.log_display.clear()
+            self._log_buffer.clear()
+            self._log_records.clear()
 
-        self.diagram_url.clear()
-        self.open_diagram_btn.setEnabled(False)
+            # Tabs that haven't been built yet have nothing to clear
+            if self.log_tab is not None:
+                self.log_display.clear()
 
-        self.tts_path.clear()
-        self.play_tts_btn.setEnabled(False)
+            if self.diagram_tab is not None:
+                self.diagram_url.clear()
+                self.open_diagram_btn.setEnabled(False)
+
+            if self.tts_tab is not None:
+                self.tts_path.clear()
+                self.play_tts_btn.setEnabled(False)
 
-        self.json_text.clear()
+            if self.json_tab is not None:
+                self.json_text.clear()
 
     def update_progress(self, message):
         """Update progress message and log display."""
+        self._pending_status = message
+        if not self._status_timer.isActive():
+            self._status_timer.start()
+        timestamp = time.strftime("%H:%M:%S")
+        line = f"[{timestamp}] {message}"
+        self._log_records.append(line)
+        self._log_buffer.append(line)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def flush_pending_status(self):
+        """Show the most recent throttled progress message."""
+        if self._pending_status is not None:
+            self.status_bar.showMessage(self._pending_status)
+            self._pending_status = None
+
+    def show_status(self, message):
+        """Show a status message immediately, discarding any pending progress message."""
+        self._status_timer.stop()
+        self._pending_status = None
         self.status_bar.showMessage(message)
-        timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
-        self.log_display.append(f"[{timestamp}] {message}")
+
+    def flush_log_buffer(self):
+        """Append all buffered log lines to the log display in one call."""
+        if self._log_buffer:
+            self._ensure_tab(self.setup_log_tab)
+            append_plain_text(self.log_display, *self._log_buffer)
+            self._log_buffer.clear()
+
+    def append_summary_chunk(self, chunk):
+        """Append streamed summary text; workflow_finished replaces it with the full summary."""
+        cursor = self.summary_text.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(chunk)
+        self.summary_text.setTextCursor(cursor)
 
     def show_clarifier_question(self, question):
         """Display clarifier question and enable response input."""
-        formatted_question = f"Clarifier: {question}\n"
-        self.clarifier_display.append(formatted_question)
+        with self._batch_updates():
+            formatted_question = f"Clarifier: {question}\n"
+            append_plain_text(self.clarifier_display, formatted_question)
 
-        # Enable response input
-        self.clarifier_response.clear()
-        self.clarifier_response.setFocus()
-        self.send_response_btn.setEnabled(True)
+            # Enable response input
+            self.clarifier_response.clear()
+            self.clarifier_response.setFocus()
+            self.send_response_btn.setEnabled(True)
 
-        # Update status
-        self.status_bar.showMessage("Waiting for your response to clarifier question...")
+            # Update status
+            self.show_status("Waiting for your response to clarifier question...")
 
-        # Switch to the clarifier tab
-        self.results_tabs.setCurrentWidget(self.clarifier_tab)
+            # Switch to the clarifier tab
+            self.results_tabs.setCurrentWidget(self.clarifier_tab)
 
     def send_clarifier_response(self):
         """Send user response to clarifier question."""
         response = self.clarifier_response.text().strip()
         if response:
-            self.clarifier_display.append(f"You: {response}")
+            append_plain_text(self.clarifier_display, f"You: {response}")
             self.worker.clarifier_response_queue.put(response)
             self.clarifier_response.clear()
             self.send_response_btn.setEnabled(False)
-            self.status_bar.showMessage("Processing your response...")
+            self.show_status("Processing your response...")
         else:
             QMessageBox.warning(self, "Input Error", "Please enter a response.")
 
@@ -533,9 +737,11 @@ class ProductConversationGUI(QMainWindow):
         else:
             self.worker.answer_queue.put("")
 
-    def workflow_finished(self, result):
+    def workflow_finished(self, payload):
         """Handle workflow completion."""
+        result = payload.get("result")
         # Hide progress bar
+        self.progress_bar.setRange(0, 100)
         self.progress_bar.setVisible(False)
         self.run_btn.setEnabled(True)
         self.send_response_btn.setEnabled(False)
@@ -550,40 +756,45 @@ class ProductConversationGUI(QMainWindow):
             QMessageBox.critical(
                 self, "Workflow Error",
                 f"Error: {result['error']}")
-            self.status_bar.showMessage("Workflow failed")
+            self.show_status("Workflow failed")
             return
 
         # Update UI with results
-        self.status_bar.showMessage("Workflow completed successfully")
-
-        # Update summary tab
-        if "summary" in result and result["summary"]:
-            self.summary_text.setText(result["summary"])
-        else:
-            self.summary_text.setText("No summary available")
-
-        # Update diagram tab
-        if "diagram_url" in result and result["diagram_url"]:
-            self.diagram_url.setText(result["diagram_url"])
-            self.open_diagram_btn.setEnabled(True)
-        else:
-            self.diagram_url.setText("No diagram generated")
-            self.open_diagram_btn.setEnabled(False)
-
-        # Update TTS tab
-        if "tts_file" in result and result["tts_file"]:
-            self.tts_path.setText(result["tts_file"])
-            self.play_tts_btn.setEnabled(True)
-        else:
-            self.tts_path.setText("No audio file generated")
-            self.play_tts_btn.setEnabled(False)
-
-        # Update JSON tab
-        try:
-            json_str = json.dumps(result, indent=2)
-            self.json_text.setText(json_str)
-        except Exception as e:
-            self.json_text.setText(f"Error displaying JSON: {str(e)}")
+        self.show_status("Workflow completed successfully")
+        with self._batch_updates():
+            self._ensure_tab(self.setup_diagram_tab)
+            self._ensure_tab(self.setup_tts_tab)
+            self._ensure_tab(self.setup_json_tab)
+
+            # Update summary tab
+            if "summary" in result and result["summary"]:
+                self.summary_text.setPlainText(result["summary"])
+            else:
+                self.summary_text.setPlainText("No summary available")
+
+            # Update diagram tab
+            if "diagram_url" in result and result["diagram_url"]:
+                self.diagram_url.setText(result["diagram_url"])
+                self.open_diagram_btn.setEnabled(True)
+            else:
+                self.diagram_url.setText("No diagram generated")
+                self.open_diagram_btn.setEnabled(False)
+
+            # Update TTS tab
+            if "tts_file" in result and result["tts_file"]:
+                self.tts_path.setText(result["tts_file"])
+                # Check the file once here so play_tts doesn't have to on every click
+                try:
+                    os.stat(result["tts_file"])
+                    self.play_tts_btn.setEnabled(True)
+                except OSError:
+                    self.play_tts_btn.setEnabled(False)
+            else:
+                self.tts_path.setText("No audio file generated")
+                self.play_tts_btn.setEnabled(False)
+
+            # Update JSON tab (serialized by the worker thread)
+            self.json_text.setPlainText(payload.get("json_str", ""))
 
         # Set a timer to switch to the summary tab after a short delay
         self.tab_switch_timer.start(1000)  # 1 second delay
@@ -597,27 +808,51 @@ class ProductConversationGUI(QMainWindow):
         """Open the diagram URL in a web browser."""
         diagram_url = self.diagram_url.text()
         if diagram_url and diagram_url != "No diagram generated":
-            webbrowser.open(diagram_url)
-            self.status_bar.showMessage("Opened diagram in browser")
+            QDesktopServices.openUrl(QUrl(diagram_url))
+            self.show_status("Opened diagram in browser")
         else:
             QMessageBox.warning(
                 self, "Diagram Error",
                 "No valid diagram URL available")
 
+    def save_logs(self):
+        """Save the run's log lines to a text file."""
+        if not self._log_records:
+            QMessageBox.warning(
+                self, "Log Error",
+                "No logs to save.")
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Logs", "workflow_log.txt", "Text Files (*.txt)")
+        if not file_path:
+            return
+
+        try:
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(self._log_records))
+                f.write("\n")
+            self.show_status(f"Logs saved to {file_path}")
+        except OSError as e:
+            QMessageBox.critical(
+                self, "Log Error",
+                f"Error saving logs: {str(e)}")
+
     def play_tts(self):
         """Play the generated TTS audio."""
         tts_file = self.tts_path.text()
-        if not tts_file or not os.path.exists(tts_file):
+        if not tts_file:
             QMessageBox.warning(
                 self, "Audio Error",
                 "Audio file not found.")
             return
 
         try:
-            pygame.mixer.init()
-            pygame.mixer.music.load(tts_file)
-            pygame.mixer.music.play()
-            self.status_bar.showMessage("Playing audio...")
+            if self._player is None:
+                self._player = QMediaPlayer(self)
+            self._player.setMedia(QMediaContent(QUrl.fromLocalFile(os.path.abspath(tts_file))))
+            self._player.play()
+            self.show_status("Playing audio...")
         except Exception as e:
             QMessageBox.critical(
                 self, "Audio Error",
@@ -629,7 +864,13 @@ class ProductConversationGUI(QMainWindow):
         self.image_path.clear()
         self.audio_path.clear()
         self.clear_all_results()
-        self.status_bar.showMessage("Inputs reset")
+        self.show_status("Inputs reset")
+
+    def closeEvent(self, event):
+        """Remember the last browsed directories for the next session."""
+        self._settings.setValue("last_image_dir", self._last_image_dir)
+        self._settings.setValue("last_audio_dir", self._last_audio_dir)
+        super().closeEvent(event)
 
 
 if __name__ == "__main__":
@@ -637,6 +878,7 @@ if __name__ == "__main__":
 
     # Set application style
     app.setStyle('Fusion')
+    app.setStyleSheet(_STYLE)
 
     window = ProductConversationGUI()
     window.show()
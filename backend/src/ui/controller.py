@@ -1,8 +1,22 @@
-import json
+import asyncio
+import atexit
+import hashlib
+import itertools
+import logging
+import os
+import random
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
 import pygame
-from typing import Dict, Any, Optional, List
-from langchain_core.messages import HumanMessage, BaseMessage
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Optional, List, Tuple
+import openai
+from langchain_core.messages import AIMessageChunk, HumanMessage, BaseMessage
+from pydantic import TypeAdapter
 
 # Import agents and utilities
 from src.agents.agent import get_clarifier_agent, get_product_agent
@@ -13,25 +27,108 @@ from src.agents.customer import get_customer_agent
 from src.agents.risk import get_risk_agent
 from src.agents.summarizer import get_summarizer_agent
 from src.utils.prompt import get_prompt_generator_agent
-from src.services.diagram.diagramAgent import generate_mermaid_link
+from src.services.diagram.diagram import generate_mermaid_link
 from src.services.tts.tts_summarize import get_tts_converter_agent
 from src.services.tts.tts import TextToSpeech, synthesize_text_with_rate_limit
 from src.config.model_config import get_model
 from src.config.model_limits import get_agent_limit
+from src.config.env import OPENAI_API_KEY
+from src.utils import fast_json, toon
+from src.utils.token_tracker import token_tracker
+
+# Built once so each product response doesn't rebuild the validator
+_PRODUCT_ADAPTER = TypeAdapter(ProductResp)
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Opening clarifier message; filled with format_map per conversation
+_CLARIFIER_TEMPLATE = ("Start gathering requirements for a new mobile app based on this: {prompt}. "
+                       "Only ask {n} critical questions that require user input.")
+
+# Attempts per agent call when the provider answers with a rate limit error
+RATE_LIMIT_ATTEMPTS = 4
+
+# Speculative product runs get their own checkpointer threads so they never
+# leak into the real conversation state
+_speculation_ids = itertools.count()
+
+# Batch runs share the agents' checkpointers, so each manager gets a unique thread
+_batch_ids = itertools.count()
+
+# Enhanced prompts keyed by a hash of the inputs, shared between managers
+ENHANCED_PROMPT_CACHE_SIZE = 128
+_enhanced_prompt_cache: "OrderedDict[str, str]" = OrderedDict()
+_enhanced_prompt_lock = threading.Lock()
+
+
+def _input_fingerprint(value: Optional[str]) -> str:
+    """Describe an input for the prompt cache; local files include their size and mtime"""
+    if not value or value.startswith("http"):
+        return str(value)
+    try:
+        st = os.stat(value)
+    except OSError:
+        return value
+    return f"{value}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def _drop_none(value):
+    """Recursively remove None-valued keys so they aren't sent to the LLM as tokens"""
+    if isinstance(value, dict):
+        return {k: _drop_none(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_drop_none(v) for v in value]
+    return value
+
+
+@lru_cache(maxsize=64)
+def _cached_model(provider: str, agent_type: str):
+    """Build one chat model per (provider, agent_type) and share it between managers"""
+    return get_model(provider=provider, agent_type=agent_type)
+
+
+@lru_cache(maxsize=64)
+def _cached_agent(factory, provider: str, agent_type: str, **kwargs):
+    """Build one agent per factory, model and limits and share it between managers"""
+    return factory(_cached_model(provider, agent_type), **kwargs)
+
+
+def _pooled_session() -> requests.Session:
+    """requests session that keeps TLS connections open for reuse"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 class ProductConversationManager:
+    # Shared by every manager: asyncio.run() would otherwise create a new
+    # default executor per workflow, and each TTS client its own connections
+    _executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="workflow")
+    _http_session = _pooled_session()
+    _mixer_quit_registered = False
+
     def __init__(self, thread_id: str = "product_conversation",
                  text_input: Optional[str] = None,
                  image_input: Optional[str] = None,
                  audio_input: Optional[str] = None,
                  model_provider: str = "openai",
                  max_questions: Optional[int] = None,
-                 max_features: Optional[int] = None):
+                 max_features: Optional[int] = None,
+                 speculative_product: bool = False,
+                 force_prompt_gen: bool = False,
+                 strict_features: bool = False):
         self.config = {"configurable": {"thread_id": thread_id}}
         self.text_input = text_input
         self.image_input = image_input
         self.audio_input = audio_input
         self.model_provider = model_provider
+        # Run the prompt generator even for text-only input
+        self.force_prompt_gen = force_prompt_gen
+        # Fail the product step if the agent still returns fewer than max_features after a retry
+        self.strict_features = strict_features
         
         # Resolve limits from config if not provided
         if max_questions is None:
@@ -41,18 +138,94 @@ class ProductConversationManager:
             
         self.max_questions = max_questions
         self.max_features = max_features
+        # max_features is fixed per instance, so the product trigger is built once
+        self._trigger_message = HumanMessage(
+            content=f"Based on the gathered requirements, please generate the full product "
+                    f"specification with at least {max_features} features. Do not return fewer."
+        )
+        # Concurrent agent calls per run; the semaphore itself is created per
+        # event loop (see _llm_semaphore) because each asyncio.run() uses a new one
+        self.max_concurrent_llm = get_agent_limit("global", "max_concurrent_llm", 5)
+        self._llm_sem: Optional[asyncio.Semaphore] = None
+        self._llm_sem_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Loop arun_full_workflow is running on; worker threads schedule agent calls on it
+        self._workflow_loop: Optional[asyncio.AbstractEventLoop] = None
         
         # Initialize model and agents with agent-specific models
-        self.clarifier_agent = get_clarifier_agent(get_model(provider=model_provider, agent_type="clarifier"), max_questions=max_questions)
-        self.product_agent = get_product_agent(get_model(provider=model_provider, agent_type="product"), max_features=max_features)
-        self.customer_runner = get_customer_agent(get_model(provider=model_provider, agent_type="customer"))
-        self.engineer_agent = get_engineer_agent(get_model(provider=model_provider, agent_type="engineer"))
-        self.risk_agent = get_risk_agent(get_model(provider=model_provider, agent_type="risk"))
-        self.summarizer_agent = get_summarizer_agent(get_model(provider=model_provider, agent_type="summarizer"))
-        self.prompt_generator = get_prompt_generator_agent(get_model(provider=model_provider, agent_type="prompt_generator"))
-        self.tts_converter = get_tts_converter_agent(get_model(provider=model_provider, agent_type="tts_converter"))
-
-        self.final_data: Dict[str, Any] = {
+        # (cached per provider and limits, so later managers reuse them)
+        self.clarifier_agent = _cached_agent(get_clarifier_agent, model_provider, "clarifier", max_questions=max_questions)
+        self.product_agent = _cached_agent(get_product_agent, model_provider, "product", max_features=max_features)
+        self.customer_runner = _cached_agent(get_customer_agent, model_provider, "customer")
+        self.engineer_agent = _cached_agent(get_engineer_agent, model_provider, "engineer")
+        self.risk_agent = _cached_agent(get_risk_agent, model_provider, "risk")
+        self.summarizer_agent = _cached_agent(get_summarizer_agent, model_provider, "summarizer")
+        self.prompt_generator = _cached_agent(get_prompt_generator_agent, model_provider, "prompt_generator")
+        self.tts_converter = _cached_agent(get_tts_converter_agent, model_provider, "tts_converter")
+
+        # Opt-in: start the product agent on the answered clarifier state while
+        # the clarifier round runs, and keep the result if that round ends the conversation
+        self.speculative_product = speculative_product
+        self._speculative_product: Optional[Tuple[int, tuple, Future]] = None
+        self._speculative_hits = 0
+
+        self._playback_thread: Optional[threading.Thread] = None
+        self.final_data: Dict[str, Any] = {}
+        self._reset_final_data()
+        self.clarifier_messages: List[BaseMessage] = []
+        self.product_messages: List[BaseMessage] = []
+        self._clear_intermediate_data()
+
+    @staticmethod
+    def clear_model_cache() -> None:
+        """Drop the shared models and agents, e.g. after the API key or model settings change"""
+        _cached_agent.cache_clear()
+        _cached_model.cache_clear()
+
+    async def _run_blocking(self, fn, *args, **kwargs):
+        """Run a blocking call on the shared executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    def _llm_semaphore(self) -> asyncio.Semaphore:
+        """The LLM concurrency semaphore for the running loop, created on first use"""
+        loop = asyncio.get_running_loop()
+        if self._llm_sem is None or self._llm_sem_loop is not loop:
+            self._llm_sem = asyncio.Semaphore(self.max_concurrent_llm)
+            self._llm_sem_loop = loop
+        return self._llm_sem
+
+    async def _ainvoke(self, agent, inputs: Dict[str, Any],
+                       config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """ainvoke an agent, capped by the run's semaphore and retried on rate limits"""
+        semaphore = self._llm_semaphore()
+        for attempt in range(RATE_LIMIT_ATTEMPTS):
+            try:
+                async with semaphore:
+                    return await agent.ainvoke(inputs, config or self.config)
+            except openai.RateLimitError as e:
+                if attempt == RATE_LIMIT_ATTEMPTS - 1:
+                    raise
+                # Back off outside the semaphore so other calls can proceed
+                delay = min(8.0, 2 ** attempt + random.random())
+                logger.warning("Rate limited (%s); retrying in %.1fs", e, delay)
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _usage(message: BaseMessage) -> Optional[Dict[str, Any]]:
+        """Token usage reported on an agent message, if any"""
+        metadata = getattr(message, "response_metadata", None)
+        return metadata.get("token_usage") if metadata else None
+
+    def _track(self, message: BaseMessage) -> Optional[Dict[str, Any]]:
+        """Record an agent message's token usage with the shared tracker"""
+        usage = self._usage(message)
+        if usage:
+            token_tracker.track_usage(usage)
+        return usage
+
+    def _reset_final_data(self) -> None:
+        """Reset collected agent outputs"""
+        self.final_data = {
             "clarifier": None,
             "product": None,
             "customer": None,
@@ -61,22 +234,119 @@ class ProductConversationManager:
             "diagram_url": None,
             "tts_file": None
         }
-        self.clarifier_messages: List[BaseMessage] = []
-        self.product_messages: List[BaseMessage] = []
+
+    def update_inputs(self, text_input: Optional[str] = None,
+                      image_input: Optional[str] = None,
+                      audio_input: Optional[str] = None) -> None:
+        """Set the inputs for the next run, reusing the already constructed models and agents"""
+        self.text_input = text_input
+        self.image_input = image_input
+        self.audio_input = audio_input
+        self._reset_final_data()
         self._clear_intermediate_data()
 
     def _clear_intermediate_data(self) -> None:
         """Clear intermediate data to free memory"""
         self.clarifier_messages.clear()
         self.product_messages.clear()
+        self._discard_speculative_product()
+
+    @staticmethod
+    def _messages_fingerprint(messages: List[BaseMessage]) -> tuple:
+        """Identify a message history by its message types and contents"""
+        return tuple((m.type, str(m.content)) for m in messages)
+
+    def _start_speculative_product(self) -> None:
+        """
+        Run the product agent on the current clarifier state on the workflow loop.
+        Called from the clarifier's worker thread; going through _ainvoke keeps the
+        run under the LLM semaphore and rate limit retries, and lets a discard cancel it.
+        """
+        self._discard_speculative_product()
+        loop = self._workflow_loop
+        if loop is None or not loop.is_running():
+            return
+        prefix = len(self.clarifier_messages)
+        fingerprint = self._messages_fingerprint(self.clarifier_messages)
+        inputs = {"messages": list(self.clarifier_messages) + [self._trigger_message]}
+        thread_id = f"{self.config['configurable']['thread_id']}-speculative-{next(_speculation_ids)}"
+        future = asyncio.run_coroutine_threadsafe(
+            self._ainvoke(self.product_agent, inputs, {"configurable": {"thread_id": thread_id}}), loop
+        )
+        self._speculative_product = (prefix, fingerprint, future)
+
+    def _track_discarded_product(self, future: Future) -> None:
+        """Count the tokens of a speculative run that finished before it was discarded"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        messages = future.result().get("messages", [])
+        if messages:
+            self._track(messages[-1])
+
+    def _discard_speculative_product(self) -> None:
+        """Cancel any pending speculative product run"""
+        if self._speculative_product is not None:
+            future = self._speculative_product[2]
+            future.cancel()
+            future.add_done_callback(self._track_discarded_product)
+            self._speculative_product = None
+
+    def _take_speculative_product(self) -> Optional[Dict[str, Any]]:
+        """
+        Return the speculative product result if it was started from the final clarifier state.
+        Only the clarifier's closing reply may follow the messages the run saw.
+        """
+        if self._speculative_product is None:
+            return None
+        prefix, fingerprint, future = self._speculative_product
+        if (len(self.clarifier_messages) > prefix + 1
+                or fingerprint != self._messages_fingerprint(self.clarifier_messages[:prefix])):
+            logger.debug("Clarifier state changed; discarding speculative product result")
+            self._discard_speculative_product()
+            return None
+        self._speculative_product = None
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.warning("Speculative product run failed: %s", e)
+            return None
+        self._speculative_hits += 1
+        logger.info("Using speculative product result (%d hits)", self._speculative_hits)
+        return result
 
     def generate_enhanced_prompt(self) -> str:
-        """Generate an enhanced prompt using multiple input modalities"""
-        print("DEBUG: Entering generate_enhanced_prompt")
+        """
+        Generate an enhanced prompt using multiple input modalities.
+        Text-only input is returned as is, since there is nothing to fuse;
+        set force_prompt_gen to send it through the prompt generator anyway.
+        """
+        logger.debug("Entering generate_enhanced_prompt")
         if not any([self.text_input, self.image_input, self.audio_input]):
-            print("DEBUG: No inputs provided, returning default prompt")
+            logger.debug("No inputs provided, returning default prompt")
             return "Create a mobile app for fitness tracking with step counting, calorie monitoring, and sleep analysis."
 
+        if not self.image_input and not self.audio_input and not self.force_prompt_gen:
+            logger.debug("Text-only input, skipping prompt_generator")
+            return self.text_input
+
+        # A fresh recording is different every time, so only cache file/URL inputs
+        cache_key = None
+        if self.audio_input != "RECORD":
+            raw_key = "|".join((
+                str(self.text_input),
+                _input_fingerprint(self.image_input),
+                _input_fingerprint(self.audio_input),
+                self.model_provider,
+            ))
+            cache_key = hashlib.blake2b(raw_key.encode("utf-8"), digest_size=16).hexdigest()
+            with _enhanced_prompt_lock:
+                cached = _enhanced_prompt_cache.get(cache_key)
+                if cached is not None:
+                    _enhanced_prompt_cache.move_to_end(cache_key)
+            if cached is not None:
+                logger.debug("Using cached enhanced prompt")
+                return cached
+
         inputs = {
             "messages": [
                 ("user", f"Process these inputs to generate a comprehensive prompt:\n"
@@ -86,241 +356,289 @@ class ProductConversationManager:
                 )
             ]
         }
-        print(f"DEBUG: Invoking prompt_generator with inputs: {inputs}")
+        logger.debug("Invoking prompt_generator with inputs: %s", inputs)
         try:
             result = self.prompt_generator.invoke(inputs, config=self.config)
-            print("DEBUG: prompt_generator invoked successfully")
-            return result["messages"][-1].content
+            logger.debug("prompt_generator invoked successfully")
+            enhanced_prompt = result["messages"][-1].content
+            if cache_key is not None:
+                with _enhanced_prompt_lock:
+                    _enhanced_prompt_cache[cache_key] = enhanced_prompt
+                    if len(_enhanced_prompt_cache) > ENHANCED_PROMPT_CACHE_SIZE:
+                        _enhanced_prompt_cache.popitem(last=False)
+            return enhanced_prompt
         except Exception as e:
-            print(f"DEBUG: Error in prompt_generator: {e}")
+            logger.error("Error in prompt_generator: %s", e)
             raise e
 
     def run_clarifier_conversation(self, max_rounds: int = 3, max_user_inputs: int = 4,
-                                  user_input_callback=None, clarifier_callback=None) -> bool:
-        """Run the clarifier conversation loop with enhanced prompt"""
-        print("Starting Clarifier conversation...")
+                                  user_input_callback=None, clarifier_callback=None,
+                                  batch_size: Optional[int] = None) -> bool:
+        """
+        Run the clarifier conversation loop with enhanced prompt.
+        Up to batch_size (default max_user_inputs) open questions are answered per
+        round and sent back to the clarifier in a single message.
+        """
+        if batch_size is None:
+            batch_size = max_user_inputs
+        logger.info("Starting Clarifier conversation...")
 
         # Generate enhanced prompt if inputs are provided
-        print("DEBUG: Calling generate_enhanced_prompt")
+        logger.debug("Calling generate_enhanced_prompt")
         initial_prompt = self.generate_enhanced_prompt()
-        print(f"DEBUG: Enhanced prompt generated: {initial_prompt[:50]}...")
+        logger.debug("Enhanced prompt generated: %.50s...", initial_prompt)
         
         initial_message = HumanMessage(
-            content=f"Start gathering requirements for a new mobile app based on this: {initial_prompt}. "
-                   f"Only ask {self.max_questions} critical questions that require user input."
+            content=_CLARIFIER_TEMPLATE.format_map({"prompt": initial_prompt, "n": self.max_questions})
         )
 
         # Initial invocation
-        print("DEBUG: Invoking clarifier_agent (Round 1)")
+        logger.debug("Invoking clarifier_agent (Round 1)")
         clarifier_result = self.clarifier_agent.invoke({"messages": [initial_message]}, self.config)
-        print("DEBUG: clarifier_agent invoked successfully")
+        logger.debug("clarifier_agent invoked successfully")
         
-        self.clarifier_messages = clarifier_result.get("messages", [])
+        # Refill the existing lists in place rather than rebinding them
+        self.clarifier_messages[:] = clarifier_result.get("messages", [])
         if not self.clarifier_messages:
-            print("Error: Clarifier agent returned no messages")
+            logger.error("Clarifier agent returned no messages")
             return False
 
         clarifier_response = self.clarifier_messages[-1].content
-        usage_metadata = self.clarifier_messages[-1].response_metadata.get("token_usage") if hasattr(self.clarifier_messages[-1], "response_metadata") else None
-        print(f"Clarifier (Round 1): {clarifier_response}")
+        usage_metadata = self._usage(self.clarifier_messages[-1])
+        logger.debug("Clarifier (Round 1): %s", clarifier_response)
 
         # Process the response
         clarifier_obj = process_agent_response(clarifier_response, ClarifierResp, usage_metadata)
         if clarifier_obj:
             self.final_data["clarifier"] = clarifier_obj.model_dump()
-            print(json.dumps(self.final_data["clarifier"], indent=2))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(fast_json.dumps(self.final_data["clarifier"], indent=True))
 
         # Conversation loop
         user_inputs_collected = 0
         for round_num in range(1, max_rounds):
             if clarifier_obj and clarifier_obj.done:
-                print(f"Clarifier finished after {round_num} rounds")
+                logger.info("Clarifier finished after %d rounds", round_num)
                 break
 
-            user_inputs_needed = False
+            answers = []
             if clarifier_obj:
-                for req in clarifier_obj.resp:
-                    if not req.answer and user_inputs_collected < max_user_inputs:
-                        # Get user answer using the appropriate callback
-                        if clarifier_callback:
-                            user_answer = clarifier_callback(req.question)
-                        elif user_input_callback:
-                            user_answer = user_input_callback(req.question)
-                        else:
-                            user_answer = get_user_input(req.question)
-
-                        req.answer = user_answer
-                        user_inputs_collected += 1
-                        user_inputs_needed = True
-                        self.clarifier_messages.append(
-                            HumanMessage(content=f"User answered: '{req.question}' -> '{user_answer}'")
-                        )
-                        print(f"\nUser inputs collected: {user_inputs_collected}/{max_user_inputs}")
+                limit = min(batch_size, max_user_inputs - user_inputs_collected)
+                pending = [req for req in clarifier_obj.resp if not req.answer][:max(limit, 0)]
+                for req in pending:
+                    # Get user answer using the appropriate callback
+                    if clarifier_callback:
+                        user_answer = clarifier_callback(req.question)
+                    elif user_input_callback:
+                        user_answer = user_input_callback(req.question)
+                    else:
+                        user_answer = get_user_input(req.question)
+
+                    req.answer = user_answer
+                    user_inputs_collected += 1
+                    answers.append(f"User answered: '{req.question}' -> '{user_answer}'")
+                    logger.info("User inputs collected: %d/%d", user_inputs_collected, max_user_inputs)
+
+                # No new answers and no budget left to collect any: another
+                # clarifier round can't learn anything new
+                if not answers and user_inputs_collected >= max_user_inputs:
+                    logger.info("User input limit reached; ending clarifier conversation")
+                    break
+
+            if answers:
+                # One message for the whole batch so the clarifier sees all answers in one call
+                self.clarifier_messages.append(HumanMessage(content="\n".join(answers)))
+
+            if self.speculative_product:
+                # This round may be the last; build the product from the answered
+                # state while the clarifier decides
+                self._start_speculative_product()
 
             # Continue conversation
             clarifier_result = self.clarifier_agent.invoke({"messages": self.clarifier_messages}, self.config)
-            self.clarifier_messages = clarifier_result.get("messages", [])
+            self.clarifier_messages[:] = clarifier_result.get("messages", [])
             if not self.clarifier_messages:
-                print("Error: Clarifier agent returned no messages in subsequent rounds")
+                logger.error("Clarifier agent returned no messages in subsequent rounds")
+                self._discard_speculative_product()
                 return False
 
             clarifier_response = self.clarifier_messages[-1].content
-            usage_metadata = self.clarifier_messages[-1].response_metadata.get("token_usage") if hasattr(self.clarifier_messages[-1], "response_metadata") else None
-            print(f"\nClarifier (Round {round_num+1}): {clarifier_response}")
+            usage_metadata = self._usage(self.clarifier_messages[-1])
+            logger.debug("Clarifier (Round %d): %s", round_num + 1, clarifier_response)
 
             clarifier_obj = process_agent_response(clarifier_response, ClarifierResp, usage_metadata)
             if clarifier_obj:
                 self.final_data["clarifier"] = clarifier_obj.model_dump()
-                print(json.dumps(self.final_data["clarifier"], indent=2))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(fast_json.dumps(self.final_data["clarifier"], indent=True))
+
+            # Another round will change the clarifier state, so its product run is stale
+            conversation_over = (clarifier_obj and clarifier_obj.done) or round_num == max_rounds - 1
+            if not conversation_over:
+                self._discard_speculative_product()
 
         return True
 
-    def run_product_agent(self) -> bool:
-        """Run the product agent with retry logic and diagram generation"""
-        print("\nGenerating Product response...")
+    def run_product_agent(self, generate_diagram: bool = True) -> bool:
+        """Run the product agent with retry logic and, optionally, diagram generation"""
+        logger.info("Generating Product response...")
         if not self.clarifier_messages:
-            print("Error: No clarifier messages available for product agent")
+            logger.error("No clarifier messages available for product agent")
             return False
 
         # Initial invocation
-        trigger_message = HumanMessage(content=f"Based on the gathered requirements, please generate the full product specification with at least {self.max_features} features.")
-        product_result = self.product_agent.invoke({"messages": self.clarifier_messages + [trigger_message]}, self.config)
-        self.product_messages = product_result.get("messages", [])
+        product_result = self._take_speculative_product()
+        if product_result is None:
+            # Append the trigger temporarily instead of copying the whole history
+            self.clarifier_messages.append(self._trigger_message)
+            try:
+                product_result = self.product_agent.invoke({"messages": self.clarifier_messages}, self.config)
+            finally:
+                self.clarifier_messages.pop()
+        self.product_messages[:] = product_result.get("messages", [])
         if not self.product_messages:
-            print("Error: Product agent returned no messages")
+            logger.error("Product agent returned no messages")
             return False
 
+        product_obj = self._parse_product_response()
+        if product_obj is None:
+            return False
+
+        # One retry with a firmer instruction instead of padding with canned features
+        if len(product_obj.features) < self.max_features:
+            logger.info("Product returned %d of %d features; asking again",
+                        len(product_obj.features), self.max_features)
+            retry_message = HumanMessage(
+                content=f"Your specification has only {len(product_obj.features)} features. "
+                        f"Regenerate the full product specification with at least {self.max_features} features."
+            )
+            product_result = self.product_agent.invoke({"messages": [*self.product_messages, retry_message]}, self.config)
+            retry_messages = product_result.get("messages", [])
+            if retry_messages:
+                self.product_messages[:] = retry_messages
+                retry_obj = self._parse_product_response()
+                if retry_obj is not None and len(retry_obj.features) > len(product_obj.features):
+                    product_obj = retry_obj
+
+            if len(product_obj.features) < self.max_features and self.strict_features:
+                logger.error("Product agent returned %d features; %d required",
+                             len(product_obj.features), self.max_features)
+                return False
+
+        self.final_data["product"] = product_obj.model_dump()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(fast_json.dumps(self.final_data["product"], indent=True))
+
+        if generate_diagram:
+            self.generate_diagram()
+
+        return True
+
+    def _parse_product_response(self) -> Optional[ProductResp]:
+        """Parse the latest product message into a ProductResp"""
         product_response = self.product_messages[-1].content
-        usage_metadata = self.product_messages[-1].response_metadata.get("token_usage") if hasattr(self.product_messages[-1], "response_metadata") else None
-        
-        from src.utils.token_tracker import token_tracker
-        if usage_metadata:
-            token_tracker.track_usage(usage_metadata)
+        self._track(self.product_messages[-1])
             
-        print(f"\nProduct Response: {product_response}")
+        logger.debug("Product Response: %s", product_response)
 
         # Try to parse the response using TOON
         try:
-            from src.utils import toon
             # Try TOON parsing first since product agent outputs TOON
             parsed = toon.parse_response(product_response)
             if not parsed:
                 # Fallback to JSON
-                parsed = json.loads(product_response)
+                parsed = fast_json.loads(product_response)
             
             # Convert to ProductResp object
-            product_obj = ProductResp(
-                name=parsed.get("name", "Unknown Product"),
-                description=parsed.get("description", "No description available"),
-                features=parsed.get("features", [])
-            )
+            return _PRODUCT_ADAPTER.validate_python({
+                "name": parsed.get("name", "Unknown Product"),
+                "description": parsed.get("description", "No description available"),
+                "features": parsed.get("features", [])
+            })
         except Exception as e:
-            print(f"Error processing response: {e}")
-            print("\nError: Could not parse product response.")
-            return False
+            logger.error("Error processing response: %s", e)
+            logger.error("Could not parse product response.")
+            return None
 
-        if product_obj:
-            self.final_data["product"] = product_obj.model_dump()
-            print(json.dumps(self.final_data["product"], indent=2))
-
-            # Generate diagram from product data with error handling
-            try:
-                product_json = json.dumps(self.final_data["product"], indent=2)
-                # Use the new generate_mermaid_link function with open_in_browser=False
-                diagram_url = generate_mermaid_link(product_json, open_in_browser=False)
-                if diagram_url:
-                    self.final_data["diagram_url"] = diagram_url
-                    print(f"\nGenerated diagram URL: {diagram_url}")
-                else:
-                    print("\nWarning: Could not generate diagram URL")
-                    self.final_data["diagram_url"] = None
-            except Exception as e:
-                print(f"\nError generating diagram: {e}")
-                self.final_data["diagram_url"] = None
-                print("Continuing without diagram...")
-
-            # Ensure we have at least 5 features
-            if len(product_obj.features) < 5:
-                print("\nAdding more features to meet the minimum requirement...")
-                # Create a new features list with at least 5 features
-                base_features = product_obj.features.copy()
-                additional_features = [
-                    {"name": "User Profiles", "reason": "Personalization", "goal_oriented": 0.7, "development_time": "1 week", "cost_estimate": 2000.0},
-                    {"name": "Social Sharing", "reason": "Engagement", "goal_oriented": 0.6, "development_time": "1 week", "cost_estimate": 1500.0},
-                    {"name": "Progress Tracking", "reason": "Motivation", "goal_oriented": 0.9, "development_time": "2 weeks", "cost_estimate": 3000.0},
-                    {"name": "Goal Setting", "reason": "User retention", "goal_oriented": 0.8, "development_time": "1 week", "cost_estimate": 2500.0},
-                    {"name": "Health Insights", "reason": "Value addition", "goal_oriented": 0.7, "development_time": "2 weeks", "cost_estimate": 4000.0}
-                ]
-
-                # Add additional features until we have at least 5
-                while len(base_features) < 5 and additional_features:
-                    base_features.append(additional_features.pop(0))
-
-                # Update the product object
-                product_obj.features = base_features
-                self.final_data["product"] = product_obj.model_dump()
-                print(json.dumps(self.final_data["product"], indent=2))
-        else:
-            print("\nError: Could not parse product response.")
-            return False
-
-        return True
-
-    def run_customer_agent(self) -> bool:
-        """Run the customer agent"""
-        print("\nGenerating Customer response...")
+    def _customer_input(self) -> Optional[Dict[str, Any]]:
+        """Build the customer agent input from the product response"""
         if not self.product_messages:
-            print("Error: No product messages available for customer agent")
-            return False
-
+            logger.error("No product messages available for customer agent")
+            return None
         product_response = self.product_messages[-1].content
-        customer_result = self.customer_runner.invoke(
-            {"messages": [HumanMessage(content=product_response)]},
-            self.config
-        )
+        return {"messages": [HumanMessage(content=product_response)]}
+
+    def _store_customer_result(self, customer_result) -> bool:
+        """Parse the customer agent result into final_data"""
         if not customer_result or not customer_result.get("messages"):
-            print("Error: Customer agent returned no result")
+            logger.error("Customer agent returned no result")
             return False
             
         customer_response = customer_result["messages"][-1].content
-        usage_metadata = customer_result["messages"][-1].response_metadata.get("token_usage") if hasattr(customer_result["messages"][-1], "response_metadata") else None
-        
-        from src.utils.token_tracker import token_tracker
-        if usage_metadata:
-            token_tracker.track_usage(usage_metadata)
+        self._track(customer_result["messages"][-1])
 
         try:
-            from src.utils import toon
             # Try TOON parsing first since customer agent outputs TOON
             parsed = toon.parse_response(customer_response)
             if not parsed:
                 # Fallback to JSON
-                parsed = json.loads(customer_response)
+                parsed = fast_json.loads(customer_response)
                 
             self.final_data["customer"] = parsed
-            print(json.dumps(parsed, indent=2))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(fast_json.dumps(parsed, indent=True))
             return True
         except Exception as e:
-            print(f"Error: Failed to parse customer response: {e}")
+            logger.error("Failed to parse customer response: %s", e)
             return False
 
-    def run_engineer_agent(self) -> bool:
-        """Run the engineer agent"""
-        print("\nGenerating Engineer response...")
-        if not self.final_data.get("customer"):
-            print("Error: No customer data available for engineer agent")
+    def generate_diagram(self) -> None:
+        """Generate a diagram from the product data; failures leave diagram_url as None"""
+        try:
+            product_json = fast_json.dumps(self.final_data["product"])
+            diagram_url = generate_mermaid_link(product_json)
+            if diagram_url:
+                self.final_data["diagram_url"] = diagram_url
+                logger.info("Generated diagram URL: %s", diagram_url)
+            else:
+                logger.warning("Could not generate diagram URL")
+                self.final_data["diagram_url"] = None
+        except Exception as e:
+            logger.error("Error generating diagram: %s", e)
+            self.final_data["diagram_url"] = None
+            logger.info("Continuing without diagram...")
+
+    def run_customer_agent(self) -> bool:
+        """Run the customer agent"""
+        logger.info("Generating Customer response...")
+        inputs = self._customer_input()
+        if inputs is None:
             return False
+        return self._store_customer_result(self.customer_runner.invoke(inputs, self.config))
 
-        engineer_result = self.engineer_agent.invoke(
-            {"messages": [HumanMessage(content=json.dumps(self.final_data["customer"]))]},
-            self.config
-        )
+    async def arun_customer_agent(self) -> bool:
+        """Run the customer agent without blocking the event loop"""
+        logger.info("Generating Customer response...")
+        inputs = self._customer_input()
+        if inputs is None:
+            return False
+        return self._store_customer_result(await self._ainvoke(self.customer_runner, inputs))
+
+    def _engineer_input(self) -> Optional[Dict[str, Any]]:
+        """Build the engineer agent input from the product specification"""
+        if not self.final_data.get("product"):
+            logger.error("No product data available for engineer agent")
+            return None
+        return {"messages": [HumanMessage(content=fast_json.dumps(_drop_none(self.final_data["product"])))]}
+
+    def _store_engineer_result(self, engineer_result) -> bool:
+        """Parse the engineer agent result into final_data"""
         if not engineer_result.get("messages"):
-            print("Error: Engineer agent returned no messages")
+            logger.error("Engineer agent returned no messages")
             return False
 
         engineer_response = engineer_result["messages"][-1].content
-        usage_metadata = engineer_result["messages"][-1].response_metadata.get("token_usage") if hasattr(engineer_result["messages"][-1], "response_metadata") else None
+        self._track(engineer_result["messages"][-1])
         
         # Use helper to parse (supports JSON and TOON) and track usage
         # We don't have a specific Pydantic model for the full response structure in agentComp.py 
@@ -329,81 +647,185 @@ class ProductConversationManager:
         # Actually, helper.process_agent_response requires a model.
         # Let's just track usage manually and use toon.parse_response directly if needed, 
         # or better, use the helper with the EngineerAnalysis model if it matches.
-        
-        from src.utils.token_tracker import token_tracker
-        if usage_metadata:
-            token_tracker.track_usage(usage_metadata)
-            
+
         try:
-            from src.utils import toon
             # Try TOON parsing first since we switched to TOON
             parsed = toon.parse_response(engineer_response)
             if not parsed:
                 # Fallback to JSON
-                parsed = json.loads(engineer_response)
+                parsed = fast_json.loads(engineer_response)
                 
             self.final_data["engineer"] = {"analysis": parsed}
-            print(json.dumps(parsed, indent=2))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(fast_json.dumps(parsed, indent=True))
             return True
         except Exception as e:
-            print(f"Error: Failed to parse engineer response: {e}")
+            logger.error("Failed to parse engineer response: %s", e)
             return False
 
-    def run_risk_agent(self) -> bool:
-        """Run the risk agent"""
-        print("\nGenerating Risk response...")
-        if not self.final_data.get("engineer"):
-            print("Error: No engineer data available for risk agent")
+    def run_engineer_agent(self) -> bool:
+        """Run the engineer agent"""
+        logger.info("Generating Engineer response...")
+        inputs = self._engineer_input()
+        if inputs is None:
             return False
+        return self._store_engineer_result(self.engineer_agent.invoke(inputs, self.config))
 
-        risk_result = self.risk_agent.invoke(
-            {"messages": [HumanMessage(content=json.dumps(self.final_data["engineer"]))]},
-            self.config
-        )
+    async def arun_engineer_agent(self) -> bool:
+        """Run the engineer agent without blocking the event loop"""
+        logger.info("Generating Engineer response...")
+        inputs = self._engineer_input()
+        if inputs is None:
+            return False
+        return self._store_engineer_result(await self._ainvoke(self.engineer_agent, inputs))
+
+    def _risk_input(self) -> Optional[Dict[str, Any]]:
+        """Build the risk agent input from the product specification and engineer analysis"""
+        if not self.final_data.get("engineer"):
+            logger.error("No engineer data available for risk agent")
+            return None
+        risk_context = {
+            "product": self.final_data.get("product"),
+            "engineer": self.final_data["engineer"]
+        }
+        return {"messages": [HumanMessage(content=fast_json.dumps(_drop_none(risk_context)))]}
+
+    def _store_risk_result(self, risk_result) -> bool:
+        """Parse the risk agent result into final_data"""
         if not risk_result.get("messages"):
-            print("Error: Risk agent returned no messages")
+            logger.error("Risk agent returned no messages")
             return False
 
         risk_response = risk_result["messages"][-1].content
-        usage_metadata = risk_result["messages"][-1].response_metadata.get("token_usage") if hasattr(risk_result["messages"][-1], "response_metadata") else None
-        
-        from src.utils.token_tracker import token_tracker
-        if usage_metadata:
-            token_tracker.track_usage(usage_metadata)
+        self._track(risk_result["messages"][-1])
 
         try:
-            from src.utils import toon
             parsed = toon.parse_response(risk_response)
             if not parsed:
-                parsed = json.loads(risk_response)
+                parsed = fast_json.loads(risk_response)
                 
             self.final_data["risk"] = {"assessment": parsed}
-            print(json.dumps(parsed, indent=2))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(fast_json.dumps(parsed, indent=True))
             return True
         except Exception as e:
-            print(f"Error: Failed to parse risk response: {e}")
+            logger.error("Failed to parse risk response: %s", e)
             return False
 
-    def run_summarizer_agent(self) -> str:
-        """Run the summarizer agent and return summary"""
-        print("\nGenerating Final Summary...")
-        summary_result = self.summarizer_agent.invoke(
-            {"messages": [HumanMessage(content=json.dumps(self.final_data, indent=2))]},
-            self.config
-        )
+    def run_risk_agent(self) -> bool:
+        """Run the risk agent"""
+        logger.info("Generating Risk response...")
+        inputs = self._risk_input()
+        if inputs is None:
+            return False
+        return self._store_risk_result(self.risk_agent.invoke(inputs, self.config))
+
+    async def arun_risk_agent(self) -> bool:
+        """Run the risk agent without blocking the event loop"""
+        logger.info("Generating Risk response...")
+        inputs = self._risk_input()
+        if inputs is None:
+            return False
+        return self._store_risk_result(await self._ainvoke(self.risk_agent, inputs))
+
+    async def _arun_engineer_then_risk(self) -> Optional[str]:
+        """Run the engineer agent and then the risk agent; return an error message on failure"""
+        if not await self.arun_engineer_agent():
+            return "Engineer agent failed"
+        if not await self.arun_risk_agent():
+            return "Risk agent failed"
+        return None
+
+    def run_summarizer_agent(self, stream_callback=None) -> str:
+        """
+        Run the summarizer agent and return summary.
+        If stream_callback is given, it is called with each piece of summary text as the model produces it.
+        """
+        logger.info("Generating Final Summary...")
+        inputs = {"messages": [HumanMessage(content=fast_json.dumps(_drop_none(self.final_data)))]}
+        if stream_callback is None:
+            summary_result = self.summarizer_agent.invoke(inputs, self.config)
+        else:
+            # "messages" yields token chunks; the last "values" item is the same state invoke() returns
+            summary_result = {}
+            for mode, payload in self.summarizer_agent.stream(inputs, self.config, stream_mode=["messages", "values"]):
+                if mode == "values":
+                    summary_result = payload
+                    continue
+                chunk, _metadata = payload
+                if isinstance(chunk, AIMessageChunk) and isinstance(chunk.content, str) and chunk.content:
+                    stream_callback(chunk.content)
         if not summary_result.get("messages"):
-            print("Error: Summarizer agent returned no messages")
+            logger.error("Summarizer agent returned no messages")
             return ""
 
         summary = summary_result["messages"][-1].content
-        print(f"\n📌 Final Summary:\n{summary}")
+        logger.debug("Final Summary:\n%s", summary)
         return summary
 
+    def _tts_text_from_response(self, response, summary: str) -> Optional[str]:
+        """Extract the speech-ready text from the TTS converter result"""
+        if not response.get("messages"):
+            logger.error("TTS converter returned no messages")
+            return None
+
+        last_message = response['messages'][-1]
+        try:
+            result = fast_json.loads(last_message.content)
+        except fast_json.JSONDecodeError:
+            logger.error("Invalid TTS response format")
+            logger.debug("Raw response: %s", last_message.content)
+            return None
+
+        tts_text = result.get("converted_text", summary)
+        logger.debug("TTS Text: %s", tts_text)
+        return tts_text
+
+    @classmethod
+    def _ensure_mixer(cls) -> None:
+        """Open the audio device once and keep it for later playbacks"""
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        if not cls._mixer_quit_registered:
+            atexit.register(pygame.mixer.quit)
+            cls._mixer_quit_registered = True
+
+    @classmethod
+    def _play_audio(cls, out_file: str) -> None:
+        """Play an audio file to completion"""
+        try:
+            cls._ensure_mixer()
+            # Release the previous clip's buffers before loading the next one
+            pygame.mixer.music.unload()
+            pygame.mixer.music.load(out_file)
+            pygame.mixer.music.play()
+            while pygame.mixer.music.get_busy():
+                time.sleep(1)
+            logger.info("Audio playback completed")
+        except Exception as e:
+            logger.warning("Playback failed: %s", e)
+
+    def wait_for_playback(self, timeout: Optional[float] = None) -> None:
+        """Block until the audio started by the last run has finished playing"""
+        if self._playback_thread is not None:
+            self._playback_thread.join(timeout)
+
+    def _synthesize_and_play(self, tts: TextToSpeech, tts_text: str, output_file: str) -> bool:
+        """Synthesize the speech-ready text to output_file and start playing it"""
+        out_file = synthesize_text_with_rate_limit(tts, tts_text, out_path=output_file)
+        self.final_data["tts_file"] = out_file
+        logger.info("Audio saved to: %s", out_file)
+
+        # Play audio in the background so the workflow can return as soon as the file exists
+        self._playback_thread = threading.Thread(target=self._play_audio, args=(out_file,), daemon=True)
+        self._playback_thread.start()
+        return True
+
     def convert_summary_to_speech(self, summary: str, output_file: str = "podcast.mp3") -> bool:
         """Convert summary to speech using TTS"""
-        print("\nConverting summary to speech...")
+        logger.info("Converting summary to speech...")
         if not summary:
-            print("Error: No summary available for TTS conversion")
+            logger.error("No summary available for TTS conversion")
             return False
 
         # Convert summary to TTS-ready format
@@ -411,101 +833,127 @@ class ProductConversationManager:
             {"messages": [("human", summary)]},
             config=self.config
         )
-        if not response.get("messages"):
-            print("Error: TTS converter returned no messages")
+        tts_text = self._tts_text_from_response(response, summary)
+        if tts_text is None:
             return False
 
-        last_message = response['messages'][-1]
-        try:
-            result = json.loads(last_message.content)
-            tts_text = result.get("converted_text", summary)
-            print("TTS Text:", tts_text)
-
-            # Synthesize speech
-            # Note: TTS still uses an external API endpoint (may require specific TTS API key)
-            from src.config.env import OPENAI_API_KEY
+        # Synthesize speech
+        # Note: TTS still uses an external API endpoint (may require specific TTS API key)
+        if not OPENAI_API_KEY:
+            logger.warning("No API key available for TTS. Skipping audio generation.")
+            return False
             
-            if not OPENAI_API_KEY:
-                print("Warning: No API key available for TTS. Skipping audio generation.")
-                return False
-                
-            tts = TextToSpeech(OPENAI_API_KEY)
-            out_file = synthesize_text_with_rate_limit(tts, tts_text, out_path=output_file)
-            self.final_data["tts_file"] = out_file
-            print(f"Audio saved to: {out_file}")
+        tts = TextToSpeech(OPENAI_API_KEY, session=self._http_session)
+        return self._synthesize_and_play(tts, tts_text, output_file)
 
-            # Play audio
-            try:
-                pygame.mixer.init()
-                pygame.mixer.music.load(out_file)
-                pygame.mixer.music.play()
-                while pygame.mixer.music.get_busy():
-                    time.sleep(1)
-                print("Audio playback completed")
-            except Exception as e:
-                print(f"Playback failed: {e}")
-            return True
-        except json.JSONDecodeError:
-            print("Error: Invalid TTS response format")
-            print("Raw response:", last_message.content)
+    async def aconvert_summary_to_speech(self, summary: str, output_file: str = "podcast.mp3") -> bool:
+        """Convert summary to speech, setting up the TTS client while the converter runs"""
+        logger.info("Converting summary to speech...")
+        if not summary:
+            logger.error("No summary available for TTS conversion")
             return False
 
-    # In refinedModelClass.py, update the run_full_workflow method
+        if not OPENAI_API_KEY:
+            logger.warning("No API key available for TTS. Skipping audio generation.")
+            return False
 
-    # refinedModelClass.py - Update the run_full_workflow method
+        # Mixer init doesn't depend on the converter output, so overlap it with the LLM call
+        tts_task = asyncio.create_task(
+            self._run_blocking(TextToSpeech, OPENAI_API_KEY, session=self._http_session)
+        )
+        response = await self._ainvoke(self.tts_converter, {"messages": [("human", summary)]})
+        tts = await tts_task
 
-    def run_full_workflow(self, user_input_callback=None, clarifier_callback=None, generate_audio: bool = True, progress_callback=None) -> Dict[str, Any]:
-        """Execute the entire conversation workflow"""
+        tts_text = self._tts_text_from_response(response, summary)
+        if tts_text is None:
+            return False
+        return await self._run_blocking(self._synthesize_and_play, tts, tts_text, output_file)
+
+    def run_full_workflow(self, user_input_callback=None, clarifier_callback=None, generate_audio: bool = True, progress_callback=None,
+                          summary_callback=None) -> Dict[str, Any]:
+        """
+        Execute the entire conversation workflow (blocking wrapper around arun_full_workflow).
+        Starts its own event loop, so callers already inside one must await arun_full_workflow instead.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("run_full_workflow cannot be called from a running event loop; "
+                               "await arun_full_workflow instead")
+        return asyncio.run(self.arun_full_workflow(
+            user_input_callback=user_input_callback,
+            clarifier_callback=clarifier_callback,
+            generate_audio=generate_audio,
+            progress_callback=progress_callback,
+            summary_callback=summary_callback
+        ))
+
+    async def arun_full_workflow(self, user_input_callback=None, clarifier_callback=None, generate_audio: bool = True, progress_callback=None,
+                                 summary_callback=None) -> Dict[str, Any]:
+        """Execute the entire conversation workflow, running independent agents concurrently"""
+        # A fresh semaphore per run, bound to the current loop
+        self._llm_sem = None
+        self._llm_semaphore()
+        self._workflow_loop = asyncio.get_running_loop()
+        diagram_task = None
         try:
             # Step 1: Run clarifier conversation
             if progress_callback:
                 progress_callback("Running clarifier conversation...")
-            if not self.run_clarifier_conversation(
+            if not await self._run_blocking(
+                self.run_clarifier_conversation,
                 user_input_callback=user_input_callback,
                 clarifier_callback=clarifier_callback
             ):
-                print("Clarifier conversation failed. Aborting workflow.")
+                logger.error("Clarifier conversation failed. Aborting workflow.")
                 return {"error": "Clarifier conversation failed"}
 
             # Step 2: Run product agent
             if progress_callback:
                 progress_callback("Generating product specifications...")
-            if not self.run_product_agent():
-                print("Product agent failed. Aborting workflow.")
+            if not await self._run_blocking(self.run_product_agent, generate_diagram=False):
+                logger.error("Product agent failed. Aborting workflow.")
                 return {"error": "Product agent failed"}
 
-            # Step 3: Run customer agent
-            if progress_callback:
-                progress_callback("Analyzing customer perspective...")
-            if not self.run_customer_agent():
-                print("Customer agent failed. Aborting workflow.")
-                return {"error": "Customer agent failed"}
-
-            # Step 4: Run engineer agent
-            if progress_callback:
-                progress_callback("Evaluating technical feasibility...")
-            if not self.run_engineer_agent():
-                print("Engineer agent failed. Aborting workflow.")
-                return {"error": "Engineer agent failed"}
+            # The diagram only needs the product data, so build it in the
+            # background and collect it before the summary
+            diagram_task = asyncio.create_task(self._run_blocking(self.generate_diagram))
 
-            # Step 5: Run risk agent
+            # Step 3: Customer analysis runs alongside engineer -> risk;
+            # both branches only need the product specification
             if progress_callback:
-                progress_callback("Assessing potential risks...")
-            if not self.run_risk_agent():
-                print("Risk agent failed. Aborting workflow.")
-                return {"error": "Risk agent failed"}
-
-            # Step 6: Generate final summary
+                progress_callback("Analyzing customer perspective, technical feasibility and risks...")
+            customer_ok, technical_error = await asyncio.gather(
+                self.arun_customer_agent(),
+                self._arun_engineer_then_risk(),
+                return_exceptions=True
+            )
+            if isinstance(customer_ok, Exception):
+                logger.error("Customer agent raised: %s", customer_ok)
+            if customer_ok is not True:
+                logger.error("Customer agent failed. Aborting workflow.")
+                return {"error": "Customer agent failed"}
+            if isinstance(technical_error, Exception):
+                logger.error("Technical analysis raised: %s", technical_error)
+                technical_error = f"Technical analysis failed: {technical_error}"
+            if technical_error:
+                logger.error("%s. Aborting workflow.", technical_error)
+                return {"error": technical_error}
+
+            # Step 4: Generate final summary (needs the diagram URL in final_data)
+            await diagram_task
             if progress_callback:
                 progress_callback("Creating final summary...")
-            summary = self.run_summarizer_agent()
+            summary = await self._run_blocking(self.run_summarizer_agent, stream_callback=summary_callback)
 
-            # Step 7: Convert summary to speech
+            # Step 5: Convert summary to speech
             if generate_audio:
                 if progress_callback:
                     progress_callback("Generating audio summary...")
-                if not self.convert_summary_to_speech(summary):
-                    print("TTS conversion failed. Continuing without audio.")
+                if not await self.aconvert_summary_to_speech(summary):
+                    logger.warning("TTS conversion failed. Continuing without audio.")
 
             # Create result dictionary
             result = {
@@ -518,8 +966,49 @@ class ProductConversationManager:
 
             return result
         except Exception as e:
-            print(f"Error during workflow execution: {str(e)}")
+            logger.error("Error during workflow execution: %s", e)
             return {"error": str(e)}
         finally:
+            # The diagram runs on an executor thread that reads and writes
+            # final_data, so let it finish before clearing run state
+            if diagram_task is not None:
+                await asyncio.gather(diagram_task, return_exceptions=True)
             # Ensure memory cleanup
             self._clear_intermediate_data()
+            self._workflow_loop = None
+
+    @classmethod
+    async def arun_batch(cls, inputs: List[Dict[str, Any]], max_concurrency: int = 8,
+                         generate_audio: bool = False, user_input_callback=None, clarifier_callback=None,
+                         **common_kwargs) -> List[Dict[str, Any]]:
+        """
+        Run the full workflow for many inputs concurrently.
+
+        Args:
+            inputs: One dict of constructor arguments per run (text_input, image_input, ...).
+            max_concurrency: Maximum number of workflows in flight at once.
+            generate_audio: Synthesize and play each summary; off by default for bulk runs.
+            user_input_callback: Answers clarifier questions for every run.
+            clarifier_callback: Answers clarifier questions for every run, taking precedence.
+                Without either, questions are skipped rather than read from stdin.
+            **common_kwargs: Constructor arguments shared by every run (model_provider, max_features, ...).
+
+        Returns:
+            The workflow results in the same order as inputs.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        batch_id = next(_batch_ids)
+        if user_input_callback is None and clarifier_callback is None:
+            # Concurrent runs can't share one stdin; answer nothing so they finish unattended
+            user_input_callback = lambda question: ""
+
+        async def run_one(index: int, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                manager = cls(**{"thread_id": f"batch-{batch_id}-{index}", **common_kwargs, **kwargs})
+                return await manager.arun_full_workflow(
+                    user_input_callback=user_input_callback,
+                    clarifier_callback=clarifier_callback,
+                    generate_audio=generate_audio
+                )
+
+        return await asyncio.gather(*(run_one(i, kwargs) for i, kwargs in enumerate(inputs)))
@@ -3,55 +3,208 @@ Product Conversation Manager - Gradio UI
 A modern web-based interface for processing product information through conversation workflows.
 """
 
+import asyncio
 import gradio as gr
-import json
 import os
 import time
-from datetime import datetime
-from typing import Dict, Any, Optional, Tuple
-from queue import Queue
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
 import threading
 
-# Import your existing classes
-from src.ui.controller import ProductConversationManager
+from src.utils import fast_json
+
+if TYPE_CHECKING:
+    from src.ui.controller import ProductConversationManager
+
+# The controller pulls in the agent stack; import it on the first run instead
+_MANAGER_CLS = None
+
+
+def _manager_class():
+    global _MANAGER_CLS
+    if _MANAGER_CLS is None:
+        from src.ui.controller import ProductConversationManager
+        _MANAGER_CLS = ProductConversationManager
+    return _MANAGER_CLS
+
+# Minimum seconds between two UI pushes; events inside the window are batched
+UI_UPDATE_INTERVAL = 0.05
+
+# Clarifier entries kept in memory for display
+HISTORY_SIZE = 2000
+
+# Only the tail of the log is sent to the browser on each update
+LOG_DISPLAY_SIZE = 500
 
 
 class GradioUIManager:
     """Manager for the Gradio UI state and workflow execution."""
     
     def __init__(self):
-        self.manager: Optional[ProductConversationManager] = None
-        self.workflow_thread: Optional[threading.Thread] = None
-        self.clarifier_queue = Queue()
-        self.user_response_queue = Queue()
+        self.manager: Optional["ProductConversationManager"] = None
+        self.workflow_task: Optional[asyncio.Task] = None
+        # Event loop the workflow was started from; clarifier answers are
+        # handed to the workflow thread through an asyncio.Queue on it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.user_response_queue: Optional[asyncio.Queue] = None
         self.is_running = False
+        # Full JSON view of current_result, rebuilt only after it is replaced
+        self._result_json: Optional[str] = None
         self.current_result = {}
-        self.logs = []
-        self.clarifier_history = []
+        # Derived display values, recomputed only when their source changes
+        self._diagram_url = ""
+        self._diagram_md = ""
+        self._tts_confirmed: Optional[str] = None
+        self.logs = deque(maxlen=LOG_DISPLAY_SIZE)
+        self.clarifier_history = deque(maxlen=HISTORY_SIZE)
+        # Joined views, re-joined only when their deque changed since the last update.
+        # The lock guards the deques, which are appended from worker threads.
+        self._logs_text = ""
+        self._clarifier_text = ""
+        self._logs_dirty = False
+        self._clarifier_dirty = False
+        self._history_lock = threading.Lock()
+        # Summary text streamed so far; shown until current_result has the final summary
+        self._summary_chunks = []
+        self._summary_text = ""
+        self._summary_dirty = False
         self.waiting_for_response = False
+        # (event loop, queue) pairs of the open UI streams
+        self._subscribers = []
+        self._subscribers_lock = threading.Lock()
         
+    def subscribe(self) -> asyncio.Queue:
+        """Register an update queue on the running event loop."""
+        queue = asyncio.Queue()
+        with self._subscribers_lock:
+            self._subscribers.append((asyncio.get_running_loop(), queue))
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Remove an update queue registered with subscribe()."""
+        with self._subscribers_lock:
+            self._subscribers = [(loop, q) for loop, q in self._subscribers if q is not queue]
+    
+    def notify(self):
+        """Wake every UI stream; safe to call from the workflow thread."""
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+            except RuntimeError:
+                # The stream's loop has already closed
+                self.unsubscribe(queue)
+    
+    @property
+    def current_result(self) -> Dict[str, Any]:
+        return self._current_result
+    
+    @current_result.setter
+    def current_result(self, value: Dict[str, Any]):
+        self._current_result = value
+        self._result_json = None
+    
+    def diagram_markdown(self, diagram_url: str) -> str:
+        """Markdown link for the diagram, rebuilt only when the URL changes."""
+        if diagram_url != self._diagram_url:
+            self._diagram_url = diagram_url
+            self._diagram_md = f"[🔗 Open Diagram in Browser]({diagram_url})" if diagram_url else ""
+        return self._diagram_md
+    
+    def playable_tts_file(self, tts_file: str) -> Optional[str]:
+        """Return tts_file once it exists on disk; a confirmed path is not checked again."""
+        if not tts_file:
+            return None
+        if tts_file != self._tts_confirmed:
+            if not os.path.exists(tts_file):
+                return None
+            self._tts_confirmed = tts_file
+        return tts_file
+    
+    async def ask(self, question: str) -> str:
+        """Show a clarifier question and wait for the answer sent from the UI."""
+        self.log(f"Clarifier question: {question}")
+        self.add_clarifier_message("Clarifier", question)
+        self.waiting_for_response = True
+        try:
+            response = await self.user_response_queue.get()
+        finally:
+            self.waiting_for_response = False
+        self.add_clarifier_message("You", response)
+        return response
+    
     def log(self, message: str):
         """Add a log message with timestamp."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = time.strftime("%H:%M:%S")
         log_entry = f"[{timestamp}] {message}"
-        self.logs.append(log_entry)
-        return "\n".join(self.logs)
+        with self._history_lock:
+            self.logs.append(log_entry)
+            self._logs_dirty = True
+        self.notify()
+    
+    def logs_text(self) -> str:
+        """The displayed log tail, joined only if a message arrived since the last call."""
+        with self._history_lock:
+            if self._logs_dirty:
+                self._logs_text = "\n".join(self.logs)
+                self._logs_dirty = False
+            return self._logs_text
     
     def clear_logs(self):
         """Clear all logs."""
-        self.logs = []
+        with self._history_lock:
+            self.logs.clear()
+            self._logs_text = ""
+            self._logs_dirty = False
         return ""
     
     def add_clarifier_message(self, sender: str, message: str):
         """Add a message to clarifier history."""
-        self.clarifier_history.append(f"{sender}: {message}")
-        return "\n\n".join(self.clarifier_history)
+        entry = f"{sender}: {message}"
+        with self._history_lock:
+            self.clarifier_history.append(entry)
+            self._clarifier_dirty = True
+        self.notify()
+    
+    def clarifier_text(self) -> str:
+        """The clarifier conversation, joined only if it changed since the last call."""
+        with self._history_lock:
+            if self._clarifier_dirty:
+                self._clarifier_text = "\n\n".join(self.clarifier_history)
+                self._clarifier_dirty = False
+            return self._clarifier_text
     
     def clear_clarifier_history(self):
         """Clear clarifier conversation history."""
-        self.clarifier_history = []
+        with self._history_lock:
+            self.clarifier_history.clear()
+            self._clarifier_text = ""
+            self._clarifier_dirty = False
         return ""
     
+    def add_summary_chunk(self, chunk: str):
+        """Append a piece of the streamed summary."""
+        with self._history_lock:
+            self._summary_chunks.append(chunk)
+            self._summary_dirty = True
+        self.notify()
+    
+    def partial_summary(self) -> str:
+        """The summary streamed so far, joined only if it changed since the last call."""
+        with self._history_lock:
+            if self._summary_dirty:
+                self._summary_text = "".join(self._summary_chunks)
+                self._summary_dirty = False
+            return self._summary_text
+    
+    def clear_partial_summary(self):
+        """Drop the streamed summary of the previous run."""
+        with self._history_lock:
+            self._summary_chunks.clear()
+            self._summary_text = ""
+            self._summary_dirty = False
+    
     def run_workflow(self, text_input: str, image_input, audio_input, generate_audio: bool):
         """Run the workflow in a background thread."""
         if self.is_running:
@@ -61,10 +214,15 @@ class GradioUIManager:
         if not text_input and not image_input and not audio_input:
             return "⚠️ Please provide at least one input (text, image, or audio).", "", "", "", "", "", ""
         
+        # Must be called from a coroutine on the server loop
+        self._loop = asyncio.get_running_loop()
+        self.user_response_queue = asyncio.Queue()
+        
         # Clear previous results
         self.current_result = {}
         self.clear_logs()
         self.clear_clarifier_history()
+        self.clear_partial_summary()
         
         # Get image path if uploaded
         image_path = image_input if image_input else None
@@ -73,7 +231,7 @@ class GradioUIManager:
         audio_path = audio_input if audio_input else None
         
         # Initialize manager with inputs
-        self.manager = ProductConversationManager(
+        self.manager = _manager_class()(
             text_input=text_input if text_input else None,
             image_input=image_path,
             audio_input=audio_path
@@ -89,26 +247,25 @@ class GradioUIManager:
             return ""
         
         def clarifier_callback(question):
-            self.log(f"Clarifier question: {question}")
-            self.add_clarifier_message("Clarifier", question)
-            self.waiting_for_response = True
-            # Wait for user response
-            response = self.user_response_queue.get()
-            self.add_clarifier_message("You", response)
-            self.waiting_for_response = False
-            return response
+            # The clarifier runs on a controller worker thread; wait there for
+            # the answer so the server loop stays free
+            return asyncio.run_coroutine_threadsafe(self.ask(question), self._loop).result()
         
         def progress_callback(message):
             self.log(message)
         
-        # Run workflow in background
-        def workflow_thread():
+        def summary_callback(chunk):
+            self.add_summary_chunk(chunk)
+        
+        # Run workflow in background on the server loop
+        async def run():
             try:
-                result = self.manager.run_full_workflow(
+                result = await self.manager.arun_full_workflow(
                     user_input_callback=user_input_callback,
                     clarifier_callback=clarifier_callback,
                     generate_audio=generate_audio,
-                    progress_callback=progress_callback
+                    progress_callback=progress_callback,
+                    summary_callback=summary_callback
                 )
                 self.current_result = result
                 self.is_running = False
@@ -118,8 +275,7 @@ class GradioUIManager:
                 self.is_running = False
                 self.log(f"❌ Error: {str(e)}")
         
-        self.workflow_thread = threading.Thread(target=workflow_thread, daemon=True)
-        self.workflow_thread.start()
+        self.workflow_task = asyncio.create_task(run())
         
         return "🚀 Workflow started! Check the Logs tab for progress.", "", "", "", "", "", ""
     
@@ -131,19 +287,21 @@ class GradioUIManager:
         if not self.waiting_for_response:
             return "⚠️ No question pending.", ""
         
-        self.user_response_queue.put(response)
+        self._loop.call_soon_threadsafe(self.user_response_queue.put_nowait, response)
         return "✅ Response sent!", ""
     
     def get_current_state(self):
         """Get current workflow state for UI updates."""
-        summary = self.current_result.get("summary", "Waiting for workflow to complete...")
+        summary = self.current_result.get("summary") or self.partial_summary() or "Waiting for workflow to complete..."
         diagram_url = self.current_result.get("diagram_url", "")
         tts_file = self.current_result.get("tts_file", "")
-        json_output = json.dumps(self.current_result, indent=2) if self.current_result else "{}"
+        if self._result_json is None:
+            self._result_json = fast_json.dumps(self.current_result, indent=True) if self.current_result else "{}"
+        json_output = self._result_json
         
         return (
-            "\n".join(self.logs),
-            "\n\n".join(self.clarifier_history),
+            self.logs_text(),
+            self.clarifier_text(),
             summary,
             diagram_url,
             tts_file,
@@ -265,35 +423,50 @@ def create_gradio_interface():
                             lines=20
                         )
         
-        # Auto-update function for polling workflow status
+        # Build the UI outputs from the current workflow state
         def update_ui_state():
             """Update UI with current workflow state."""
             logs, clarifier, summary, diagram_url, tts_file, json_output = ui_manager.get_current_state()
             
-            # Update diagram link markdown
-            diagram_md = ""
-            if diagram_url:
-                diagram_md = f"[🔗 Open Diagram in Browser]({diagram_url})"
-            
             return (
                 logs,
                 clarifier,
                 summary,
                 diagram_url,
-                diagram_md,
-                tts_file if tts_file and os.path.exists(tts_file) else None,
+                ui_manager.diagram_markdown(diagram_url),
+                ui_manager.playable_tts_file(tts_file),
                 tts_file,
                 json_output
             )
         
+        async def stream_ui_state():
+            """Push UI state whenever the workflow reports a change."""
+            queue = ui_manager.subscribe()
+            try:
+                yield update_ui_state()
+                last_push = time.monotonic()
+                while True:
+                    await queue.get()
+                    # Let a burst of log lines land before pushing them together
+                    delay = UI_UPDATE_INTERVAL - (time.monotonic() - last_push)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    while not queue.empty():
+                        queue.get_nowait()
+                    yield update_ui_state()
+                    last_push = time.monotonic()
+            finally:
+                ui_manager.unsubscribe(queue)
+        
         # Event handlers
-        def run_workflow_handler(text, image, audio, gen_audio):
+        async def run_workflow_handler(text, image, audio, gen_audio):
             status = ui_manager.run_workflow(text, image, audio, gen_audio)
             return status
         
         def reset_handler():
             ui_manager.clear_logs()
             ui_manager.clear_clarifier_history()
+            ui_manager.clear_partial_summary()
             ui_manager.current_result = {}
             return (
                 "",  # text_input
@@ -351,25 +524,9 @@ def create_gradio_interface():
             outputs=[clarifier_status, clarifier_response]
         )
         
-        # Auto-refresh every 2 seconds to update workflow progress
-        timer = gr.Timer(2)
-        timer.tick(
-            fn=update_ui_state,
-            outputs=[
-                logs_display,
-                clarifier_display,
-                summary_display,
-                diagram_url_display,
-                diagram_link,
-                audio_display,
-                audio_file_path,
-                json_display
-            ]
-        )
-        
-        # Initial load
+        # Stream state updates to each page for as long as it is open
         demo.load(
-            fn=update_ui_state,
+            fn=stream_ui_state,
             outputs=[
                 logs_display,
                 clarifier_display,
@@ -379,14 +536,20 @@ def create_gradio_interface():
                 audio_display,
                 audio_file_path,
                 json_display
-            ]
+            ],
+            concurrency_limit=None
         )
     
+    # Let several users run events at once and bound the backlog
+    demo.queue(default_concurrency_limit=8, max_size=32, api_open=False)
+    
     return demo
 
 
 def launch_gradio_ui(share=False, server_port=7860):
     """Launch the Gradio interface."""
+    if threading.current_thread() is not threading.main_thread():
+        raise RuntimeError("launch_gradio_ui must run on the main thread")
     demo = create_gradio_interface()
     demo.launch(share=share, server_port=server_port)
 
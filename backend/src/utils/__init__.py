@@ -1,3 +1,3 @@
-from .helper import get_user_input, process_agent_response
+from .helper import aget_user_input, get_user_input, process_agent_response
 from .prompt import prompt_generator
 from .toon import parse_response, dumps, loads
@@ -0,0 +1,68 @@
+"""
+In-process LRU cache for the prompt generator's OpenAI tool calls.
+
+Keys are content hashes of the input (text, or the bytes of an image or
+audio file) combined with the model name and a prompt version, so the
+same input reached through a different path still hits the cache and a
+prompt change invalidates old entries.
+"""
+
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+CACHE_SIZE = 512
+
+# Bump when a tool prompt changes so older responses are not reused
+PROMPT_VERSION = "v1"
+
+_cache: "OrderedDict[str, str]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _key(kind: str, digest: str, model: str) -> str:
+    return f"{kind}|{digest}|{model}|{PROMPT_VERSION}"
+
+
+def text_key(kind: str, text: str, model: str) -> str:
+    """Cache key for a text input."""
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    return _key(kind, digest, model)
+
+
+def file_key(kind: str, path: str, model: str) -> str:
+    """Cache key for the contents of a local file."""
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hasher.update(mapped)
+    return _key(kind, hasher.hexdigest(), model)
+
+
+def get(key: str) -> Optional[str]:
+    """Return the cached response for key, if any."""
+    with _lock:
+        value = _cache.get(key)
+        if value is not None:
+            _cache.move_to_end(key)
+        return value
+
+
+def put(key: str, value: str) -> None:
+    """Store a successful response, evicting the least recently used entry."""
+    with _lock:
+        _cache[key] = value
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def clear() -> None:
+    """Drop every cached response."""
+    with _lock:
+        _cache.clear()
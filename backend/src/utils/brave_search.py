@@ -5,10 +5,55 @@ A wrapper for the Brave Search Web Search API.
 Brave Search provides a fast, reliable search API with generous free tier.
 """
 
+import importlib.util
+import threading
+import time
+from collections import OrderedDict
+import httpx
 import requests
-from typing import Optional
+from typing import Optional, Tuple
 import os
 
+from src.utils import fast_json
+
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 without it
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Successful results keyed by (query, count), shared by every BraveSearch
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL = 300  # seconds
+_search_cache: "OrderedDict[Tuple[str, int], Tuple[float, str]]" = OrderedDict()
+_search_cache_lock = threading.Lock()
+
+
+def _cache_get(query: str, count: int) -> Optional[str]:
+    with _search_cache_lock:
+        entry = _search_cache.get((query, count))
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > SEARCH_CACHE_TTL:
+            del _search_cache[(query, count)]
+            return None
+        _search_cache.move_to_end((query, count))
+        return entry[1]
+
+
+def _cache_put(query: str, count: int, result: str) -> str:
+    # Errors (rate limits, timeouts) are retried on the next call
+    if not result.startswith("Error:"):
+        with _search_cache_lock:
+            _search_cache[(query, count)] = (time.monotonic(), result)
+            _search_cache.move_to_end((query, count))
+            while len(_search_cache) > SEARCH_CACHE_SIZE:
+                _search_cache.popitem(last=False)
+    return result
+
+
+def clear_search_cache():
+    """Drop every cached search result."""
+    with _search_cache_lock:
+        _search_cache.clear()
+
 
 class BraveSearch:
     """Search tool using Brave Search API."""
@@ -32,6 +77,36 @@ class BraveSearch:
         
         self.count = min(count, 20)  # Brave API max is 20
         
+        # Reuse one keep-alive connection pool for every query
+        self._session = requests.Session()
+        self._session.headers.update(self._headers())
+        # Created on first asearch() so it binds to the caller's event loop
+        self._aclient: Optional[httpx.AsyncClient] = None
+    
+    def _headers(self) -> dict:
+        return {
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip",
+            "X-Subscription-Token": self.api_key
+        }
+    
+    def close(self):
+        """Close the underlying HTTP session."""
+        self._session.close()
+    
+    async def aclose(self):
+        """Close the HTTP session and the async client, if one was created."""
+        self.close()
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        
     def search(self, query: str) -> str:
         """
         Search using Brave Search API.
@@ -42,62 +117,22 @@ class BraveSearch:
         Returns:
             Formatted search results as a string
         """
+        cached = _cache_get(query, self.count)
+        if cached is not None:
+            return cached
         try:
-            headers = {
-                "Accept": "application/json",
-                "Accept-Encoding": "gzip",
-                "X-Subscription-Token": self.api_key
-            }
-            
             params = {
                 "q": query,
                 "count": self.count,
             }
             
-            response = requests.get(
+            response = self._session.get(
                 self.BASE_URL,
-                headers=headers,
                 params=params,
                 timeout=10
             )
             
-            # Handle rate limiting
-            if response.status_code == 429:
-                return (
-                    f"Error: Brave Search API rate limit exceeded. "
-                    f"You have used your monthly quota of queries. "
-                    f"Please check your API usage at https://brave.com/search/api/"
-                )
-            
-            # Handle other errors
-            if response.status_code != 200:
-                return (
-                    f"Error: Brave Search API returned status {response.status_code}. "
-                    f"Message: {response.text}"
-                )
-            
-            data = response.json()
-            
-            # Extract web results
-            web_results = data.get("web", {}).get("results", [])
-            
-            if not web_results:
-                return f"No results found for query: '{query}'"
-            
-            # Format results for the LLM
-            formatted_results = []
-            for i, result in enumerate(web_results, 1):
-                title = result.get("title", "No title")
-                url = result.get("url", "")
-                description = result.get("description", "No description available")
-                
-                formatted_results.append(
-                    f"{i}. {title}\n"
-                    f"   URL: {url}\n"
-                    f"   {description}\n"
-                )
-            
-            return "\n".join(formatted_results)
+            return _cache_put(query, self.count, self._format_response(query, response))
             
         except requests.exceptions.Timeout:
             return f"Error: Request timed out while searching for '{query}'"
@@ -106,6 +141,76 @@ class BraveSearch:
         except Exception as e:
             return f"Error: Unexpected error during search: {str(e)}"
     
+    async def asearch(self, query: str) -> str:
+        """
+        Search using Brave Search API without blocking the event loop.
+        
+        Args:
+            query: Search query string
+            
+        Returns:
+            Formatted search results as a string
+        """
+        cached = _cache_get(query, self.count)
+        if cached is not None:
+            return cached
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(http2=_HTTP2_AVAILABLE, timeout=10.0, headers=self._headers())
+        try:
+            response = await self._aclient.get(
+                self.BASE_URL,
+                params={"q": query, "count": self.count}
+            )
+            return _cache_put(query, self.count, self._format_response(query, response))
+            
+        except httpx.TimeoutException:
+            return f"Error: Request timed out while searching for '{query}'"
+        except httpx.HTTPError as e:
+            return f"Error: Network error occurred: {str(e)}"
+        except Exception as e:
+            return f"Error: Unexpected error during search: {str(e)}"
+    
+    def _format_response(self, query: str, response) -> str:
+        """Turn a requests or httpx response from the Brave API into text for the LLM."""
+        # Handle rate limiting
+        if response.status_code == 429:
+            return (
+                f"Error: Brave Search API rate limit exceeded. "
+                f"You have used your monthly quota of queries. "
+                f"Please check your API usage at https://brave.com/search/api/"
+            )
+        
+        # Handle other errors
+        if response.status_code != 200:
+            return (
+                f"Error: Brave Search API returned status {response.status_code}. "
+                f"Message: {response.text}"
+            )
+        
+        data = fast_json.loads(response.content)
+        
+        # Extract web results
+        web_results = data.get("web", {}).get("results", [])
+        
+        if not web_results:
+            return f"No results found for query: '{query}'"
+        
+        # Format results for the LLM
+        formatted_results = []
+        # The API can return more than requested; stop at the configured count
+        for i, result in enumerate(web_results[:self.count], 1):
+            title = result.get("title", "No title")
+            url = result.get("url", "")
+            description = result.get("description", "No description available")
+            
+            formatted_results.append(
+                f"{i}. {title}\n"
+                f"   URL: {url}\n"
+                f"   {description}\n"
+            )
+        
+        return "\n".join(formatted_results)
+    
     def run(self, query: str) -> str:
         """
         Run search (alias for compatibility with LangChain Tool interface).
@@ -132,8 +237,8 @@ def brave_search(query: str, api_key: Optional[str] = None, count: int = 5) -> s
     Returns:
         Formatted search results as a string
     """
-    searcher = BraveSearch(api_key=api_key, count=count)
-    return searcher.search(query)
+    with BraveSearch(api_key=api_key, count=count) as searcher:
+        return searcher.search(query)
 
 
 if __name__ == "__main__":
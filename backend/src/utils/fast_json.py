@@ -0,0 +1,51 @@
+"""
+JSON helpers backed by orjson when it is installed.
+
+orjson parses and serializes several times faster than the standard
+library and returns compact output by default. When it is not available
+these helpers fall back to the stdlib json module with equivalent output.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# keep catching the stdlib exception type.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """
+    Parse a JSON document from str or bytes.
+
+    Malformed input is re-parsed once with the stdlib so the raised error
+    carries its line/column message.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            if isinstance(data, memoryview):
+                data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Serialize obj to a JSON string.
+
+    Args:
+        obj: The object to serialize.
+        indent: Pretty-print with a two-space indent.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
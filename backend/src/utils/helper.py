@@ -1,11 +1,43 @@
-from typing import Optional
-import json
-import re
-from pydantic import BaseModel
+import asyncio
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional, Type
+from pydantic import BaseModel, TypeAdapter
 
-from src.utils import toon
+from src.utils import fast_json, toon
 from src.utils.token_tracker import token_tracker
 
+@lru_cache(maxsize=16)
+def type_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """TypeAdapter for a response model, built once per class"""
+    return TypeAdapter(model)
+
+def _first_json_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} in text, skipping braces inside strings"""
+    start = text.find("{")
+    if start == -1:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
 def process_agent_response(response_content: str, response_model: BaseModel, usage_metadata: Optional[dict] = None) -> Optional[BaseModel]:
     """Parse and validate the agent response as the given model"""
     
@@ -15,11 +47,10 @@ def process_agent_response(response_content: str, response_model: BaseModel, usa
 
     try:
         # Try to extract JSON from the response first
-        json_match = re.search(r'\{.*\}', response_content, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(0)
-            response_dict = json.loads(json_str)
-            return response_model(**response_dict)
+        json_str = _first_json_object(response_content)
+        if json_str:
+            response_dict = fast_json.loads(json_str)
+            return type_adapter(response_model).validate_python(response_dict)
     except Exception as e:
         print(f"JSON parsing failed: {e}")
 
@@ -27,7 +58,7 @@ def process_agent_response(response_content: str, response_model: BaseModel, usa
     try:
         toon_dict = toon.parse_response(response_content)
         if toon_dict:
-            return response_model(**toon_dict)
+            return type_adapter(response_model).validate_python(toon_dict)
     except Exception as e:
         print(f"TOON parsing failed: {e}")
         
@@ -39,3 +70,9 @@ def get_user_input(question: str) -> str:
     print(f"Question: {question}")
     user_answer = input("Your answer: ")
     return user_answer
+
+async def aget_user_input(question: str, asker: Optional[Callable[[str], Awaitable[str]]] = None) -> str:
+    """Ask the user without blocking the event loop; asker overrides the console prompt"""
+    if asker is not None:
+        return await asker(question)
+    return await asyncio.to_thread(get_user_input, question)
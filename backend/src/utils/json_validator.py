@@ -1,7 +1,12 @@
-import json
+import re
 from typing import Any, Dict, Optional, Tuple, Type
 from pydantic import BaseModel, ValidationError
 
+from src.utils import fast_json
+from src.utils.helper import type_adapter
+
+_JSON_BLOCK_RE = re.compile(r"```json\n(.*?)\n```", re.DOTALL)
+
 def validate_json_string(text: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
     """
     Validates if a string is valid JSON.
@@ -17,16 +22,15 @@ def validate_json_string(text: str) -> Tuple[Optional[Dict[str, Any]], Optional[
     try:
         # Try to find JSON block if embedded in markdown
         if "```json" in text:
-            import re
-            match = re.search(r"```json\n(.*?)\n```", text, re.DOTALL)
+            match = _JSON_BLOCK_RE.search(text)
             if match:
                 text = match.group(1)
         
-        data = json.loads(text)
-        if not isinstance(data, dict):
+        data = fast_json.loads(text)
+        if type(data) is not dict:
              return None, "JSON content must be a dictionary/object"
         return data, None
-    except json.JSONDecodeError as e:
+    except fast_json.JSONDecodeError as e:
         return None, f"Invalid JSON format: {str(e)}"
     except Exception as e:
         return None, f"Unexpected error parsing JSON: {str(e)}"
@@ -45,7 +49,7 @@ def validate_model(data: Dict[str, Any], model: Type[BaseModel]) -> Tuple[Option
         - An error message if invalid, None otherwise.
     """
     try:
-        instance = model(**data)
+        instance = type_adapter(model).validate_python(data)
         return instance, None
     except ValidationError as e:
         return None, f"Schema validation failed: {str(e)}"
@@ -1,17 +1,31 @@
+import asyncio
+import atexit
+import bisect
 import os
 import json
-import base64
+import mimetypes
+import mmap
+import threading
 import tempfile
 import io
+import wave
+from functools import lru_cache
+from typing import List
 import sounddevice as sd
-import soundfile as sf
 import numpy as np
 from openai import OpenAI
 from langchain_openai import ChatOpenAI
 from langgraph.prebuilt import create_react_agent
 from langgraph.checkpoint.memory import MemorySaver
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool, tool
 from src.config.env import OPENAI_API_KEY, OPENAI_API_BASE
+from src.utils import _llm_cache
+
+# SIMD base64 when installed; same API as the stdlib module
+try:
+    import pybase64 as _b64
+except ImportError:  # pragma: no cover - optional dependency
+    import base64 as _b64
 
 # --- Initialize OpenAI client ---
 openai_client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_API_BASE)
@@ -20,6 +34,24 @@ openai_client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_API_BASE)
 memory = MemorySaver()
 
 # --- Audio recording functionality ---
+# One input stream and sample buffer are reused by every recording
+MAX_RECORD_SECONDS = 60
+RECORD_BLOCK_SIZE = 1024
+_stream = None
+_buf = None
+_record_lock = threading.Lock()
+
+def _input_stream(samplerate):
+    """Return the shared input stream, reopening it if the sample rate changed"""
+    global _stream
+    if _stream is not None and _stream.samplerate != samplerate:
+        _stream.close()
+        _stream = None
+    if _stream is None:
+        _stream = sd.InputStream(samplerate=samplerate, channels=1, dtype='int16', blocksize=RECORD_BLOCK_SIZE)
+        atexit.register(_stream.close)
+    return _stream
+
 def record_audio(duration=5, samplerate=16000):
     """Record audio from microphone and return as bytes.
     Args:
@@ -28,14 +60,35 @@ def record_audio(duration=5, samplerate=16000):
     Returns:
         Audio data as bytes in WAV format
     """
+    global _buf
     print(f"Recording audio for {duration} seconds...")
-    recording = sd.rec(int(duration * samplerate), samplerate=samplerate, channels=1, dtype='float32')
-    sd.wait()  # Wait until recording is finished
-    # Create a BytesIO object to hold the WAV data
-    buffer = io.BytesIO()
-    sf.write(buffer, recording, samplerate, format='WAV')
-    buffer.seek(0)  # Rewind the buffer to the beginning
-    audio_bytes = buffer.read()
+    frames = int(duration * samplerate)
+    with _record_lock:
+        if _buf is None or len(_buf) < frames:
+            _buf = np.empty((max(frames, MAX_RECORD_SECONDS * samplerate), 1), dtype=np.int16)
+        # Record 16-bit PCM directly so the samples can go into the WAV as-is;
+        # the stream only captures between start() and stop()
+        stream = _input_stream(samplerate)
+        stream.start()
+        try:
+            pos = 0
+            while pos < frames:
+                n = min(RECORD_BLOCK_SIZE, frames - pos)
+                data, _ = stream.read(n)
+                _buf[pos:pos + n] = data
+                pos += n
+        finally:
+            stream.stop()
+        recording = _buf[:frames]
+        # Create a BytesIO object to hold the WAV data; recording is a view of
+        # the shared buffer, so write it before releasing the lock
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(samplerate)
+            wav.writeframes(recording)
+    audio_bytes = buffer.getvalue()
     print("Recording complete")
     return audio_bytes
 
@@ -48,7 +101,12 @@ def encode_image(image_path):
         Base64 encoded string of the image
     """
     with open(image_path, "rb") as image_file:
-        return base64.b64encode(image_file.read()).decode('utf-8')
+        # mmap cannot map an empty file
+        if os.fstat(image_file.fileno()).st_size == 0:
+            return ""
+        # Encode straight from the page cache instead of reading a bytes copy
+        with mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _b64.b64encode(mapped).decode('ascii')
 
 # --- Helper function to determine MIME type from file extension ---
 def get_mime_type(file_path):
@@ -58,16 +116,15 @@ def get_mime_type(file_path):
     Returns:
         MIME type string
     """
-    ext = os.path.splitext(file_path)[1].lower()
-    mime_types = {
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.png': 'image/png',
-        '.gif': 'image/gif',
-        '.bmp': 'image/bmp',
-        '.webp': 'image/webp'
-    }
-    return mime_types.get(ext, 'image/jpeg')  # Default to jpeg if not found
+    return _mime_for_ext(os.path.splitext(file_path)[1].lower())
+
+@lru_cache(maxsize=128)
+def _mime_for_ext(ext):
+    """Image MIME type for a lowercase extension, from the platform mimetypes table"""
+    mime_type, _ = mimetypes.guess_type(f"image{ext}", strict=False)
+    if mime_type and mime_type.startswith('image/'):
+        return mime_type
+    return 'image/jpeg'  # Default to jpeg if not found
 
 # --- Define tools for processing different input types ---
 @tool
@@ -82,6 +139,11 @@ def analyze_image(image_input: str) -> str:
         # Check if input is a URL or local file path
         if image_input.startswith('http'):
             # It's a URL
+            cache_key = _llm_cache.text_key("image", image_input, "gpt-4o-mini")
+            cached = _llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             image_content = {
                 "type": "image_url",
                 "image_url": {
@@ -93,6 +155,11 @@ def analyze_image(image_input: str) -> str:
             if not os.path.exists(image_input):
                 return json.dumps({"error": f"Image file not found: {image_input}"})
 
+            cache_key = _llm_cache.file_key("image", image_input, "gpt-4o-mini")
+            cached = _llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             # Encode image to base64
             base64_image = encode_image(image_input)
             mime_type = get_mime_type(image_input)
@@ -123,7 +190,10 @@ def analyze_image(image_input: str) -> str:
             max_tokens=1024,
             response_format={"type": "json_object"},
         )
-        return completion.choices[0].message.content
+        content = completion.choices[0].message.content
+        if content:
+            _llm_cache.put(cache_key, content)
+        return content
     except Exception as e:
         return json.dumps({"error": f"Image analysis failed: {str(e)}"})
 
@@ -147,16 +217,128 @@ def transcribe_audio(audio_input: str) -> str:
                 model="whisper-1",
             )
         else:
-            # Use provided file path
+            # Use provided file path; a fresh recording is never cached
+            cache_key = _llm_cache.file_key("audio", audio_input, "whisper-1")
+            cached = _llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
             with open(audio_input, "rb") as file:
                 transcription = openai_client.audio.transcriptions.create(
                     file=file,
                     model="whisper-1",
                 )
+            if transcription.text:
+                _llm_cache.put(cache_key, transcription.text)
         return transcription.text
     except Exception as e:
         return f"Audio transcription failed: {str(e)}"
 
+# Whisper rejects uploads above 25 MB
+WHISPER_MAX_BYTES = 25 * 1024 * 1024
+# Size of the header the wave module writes for PCM data
+WAV_HEADER_BYTES = 44
+# Silence between stitched clips so no segment straddles two of them
+BATCH_SILENCE_SECONDS = 1.0
+
+def _read_wav(path):
+    """Return ((channels, sample width, rate), frames) for a PCM WAV file, or None"""
+    try:
+        with wave.open(path, 'rb') as wav:
+            return (wav.getnchannels(), wav.getsampwidth(), wav.getframerate()), wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+
+def _transcribe_wav_batch(clips, params):
+    """Transcribe same-format WAV clips in one Whisper request and split the text per clip"""
+    channels, sampwidth, rate = params
+    frame_bytes = channels * sampwidth
+    # 8-bit PCM is unsigned, so its silence is 0x80 rather than 0
+    silence = (b'\x80' if sampwidth == 1 else b'\x00') * (int(BATCH_SILENCE_SECONDS * rate) * frame_bytes)
+
+    buffer = io.BytesIO()
+    starts = []
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sampwidth)
+        wav.setframerate(rate)
+        written = 0
+        for _, frames in clips:
+            starts.append(written / (frame_bytes * rate))
+            wav.writeframes(frames)
+            wav.writeframes(silence)
+            written += len(frames) + len(silence)
+    buffer.seek(0)
+    buffer.name = "batched_audio.wav"
+
+    transcription = openai_client.audio.transcriptions.create(
+        file=buffer,
+        model="whisper-1",
+        response_format="verbose_json",
+        timestamp_granularities=["segment"],
+    )
+    texts = [[] for _ in clips]
+    for segment in transcription.segments or []:
+        # Attribute each segment to the clip its midpoint falls in
+        index = bisect.bisect_right(starts, (segment.start + segment.end) / 2) - 1
+        texts[max(index, 0)].append(segment.text.strip())
+    return [" ".join(parts) for parts in texts]
+
+@tool
+def transcribe_audio_batch(audio_inputs: List[str]) -> str:
+    """Transcribe several audio files, batching WAV clips into as few Whisper requests as possible.
+    Args:
+        audio_inputs: File paths of the audio files to transcribe.
+    Returns:
+        JSON object mapping each file path to its transcribed text.
+    """
+    results = {}
+    pending = {}  # WAV params -> [(path, frames)]
+    for path in audio_inputs:
+        cached = _llm_cache.get(_llm_cache.file_key("audio", path, "whisper-1")) if os.path.exists(path) else None
+        if cached is not None:
+            results[path] = cached
+            continue
+        wav = _read_wav(path) if os.path.exists(path) else None
+        if wav is None:
+            # Not a PCM WAV file; send it on its own
+            results[path] = transcribe_audio.func(path)
+            continue
+        pending.setdefault(wav[0], []).append((path, wav[1]))
+
+    for params, clips in pending.items():
+        frame_bytes = params[0] * params[1]
+        silence_bytes = int(BATCH_SILENCE_SECONDS * params[2]) * frame_bytes
+        budget = WHISPER_MAX_BYTES - WAV_HEADER_BYTES
+        batch, size = [], 0
+        # Clips are packed into requests under the upload limit; a clip too
+        # large to batch is sent alone, or reported if it can't be uploaded at all
+        for clip in clips + [None]:
+            clip_size = len(clip[1]) + silence_bytes if clip else 0
+            if clip is not None and clip_size > budget:
+                path = clip[0]
+                if len(clip[1]) <= budget:
+                    results[path] = transcribe_audio.func(path)
+                else:
+                    results[path] = "Audio transcription failed: file exceeds Whisper's 25 MB upload limit"
+                continue
+            if batch and (clip is None or size + clip_size > budget):
+                try:
+                    texts = _transcribe_wav_batch(batch, params)
+                except Exception as e:
+                    texts = [f"Audio transcription failed: {str(e)}"] * len(batch)
+                else:
+                    for (path, _), text in zip(batch, texts):
+                        if text:
+                            _llm_cache.put(_llm_cache.file_key("audio", path, "whisper-1"), text)
+                for (path, _), text in zip(batch, texts):
+                    results[path] = text
+                batch, size = [], 0
+            if clip is not None:
+                batch.append(clip)
+                size += clip_size
+
+    return json.dumps({path: results[path] for path in audio_inputs})
+
 @tool
 def process_text(text_input: str) -> str:
     """Process text input to extract key requirements.
@@ -166,6 +348,10 @@ def process_text(text_input: str) -> str:
         Structured summary of key points from the text.
     """
     try:
+        cache_key = _llm_cache.text_key("text", text_input, "gpt-4o-mini")
+        cached = _llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
         completion = openai_client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
@@ -182,23 +368,60 @@ def process_text(text_input: str) -> str:
             max_tokens=1024,
             response_format={"type": "json_object"},
         )
-        return completion.choices[0].message.content
+        content = completion.choices[0].message.content
+        if content:
+            _llm_cache.put(cache_key, content)
+        return content
     except Exception as e:
         return json.dumps({"error": f"Text processing failed: {str(e)}"})
 
+async def _aanalyze_inputs(image_input: str = "", audio_input: str = "", text_input: str = "") -> str:
+    """Analyze image, audio and text inputs concurrently in one step.
+    Args:
+        image_input: Image URL or local file path, or empty if there is no image.
+        audio_input: Audio file path or "RECORD", or empty if there is no audio.
+        text_input: Raw text input, or empty if there is no text.
+    Returns:
+        JSON object with image_analysis, audio_transcription and text_analysis for the inputs given.
+    """
+    # The tools are blocking OpenAI calls; running them on threads lets
+    # their round-trips overlap while keeping their caching and error handling
+    jobs = {}
+    if image_input:
+        jobs["image_analysis"] = asyncio.to_thread(analyze_image.func, image_input)
+    if audio_input:
+        jobs["audio_transcription"] = asyncio.to_thread(transcribe_audio.func, audio_input)
+    if text_input:
+        jobs["text_analysis"] = asyncio.to_thread(process_text.func, text_input)
+    results = await asyncio.gather(*jobs.values())
+    return json.dumps(dict(zip(jobs, results)))
+
+def _analyze_inputs(image_input: str = "", audio_input: str = "", text_input: str = "") -> str:
+    return asyncio.run(_aanalyze_inputs(image_input, audio_input, text_input))
+
+# Serves both agent.invoke and agent.ainvoke
+analyze_inputs = StructuredTool.from_function(
+    func=_analyze_inputs,
+    coroutine=_aanalyze_inputs,
+    name="analyze_inputs",
+    description=_aanalyze_inputs.__doc__,
+)
+
 # --- Create the prompt generation agent ---
 def get_prompt_generator_agent(model):
     return create_react_agent(
         model=model,
-        tools=[analyze_image, transcribe_audio, process_text],
+        tools=[analyze_inputs, analyze_image, transcribe_audio, transcribe_audio_batch, process_text],
         prompt="""
 You are a Prompt Generation Specialist.
 Your task is to convert image, audio, and text inputs into a comprehensive,
 well-structured prompt that clearly defines requirements for a product or system and definition of the product.
 Your workflow:
-1. Use the appropriate tools to process each input type:
+1. When you have more than one input type, call analyze_inputs once with all of them;
+   it processes them concurrently. Otherwise use the tool for that input type:
    - For images: use analyze_image tool with either a URL or local file path
-   - For audio: use transcribe_audio tool with either a file path or "RECORD" to record new audio
+   - For audio: use transcribe_audio tool with either a file path or "RECORD" to record new audio;
+     with two or more audio files, use transcribe_audio_batch with all of their paths
    - For text: use process_text tool with the raw text
 2. Analyze the outputs from all tools to identify:
    - Core requirements and features
@@ -1,30 +1,30 @@
 import threading
 import time
+from collections import deque
 from typing import Dict, Any
 
+# Approximate costs per token (example rates, adjust as needed)
+_INPUT_RATE_PER_TOKEN = 0.5e-6  # $0.50 per 1M tokens
+_OUTPUT_RATE_PER_TOKEN = 1.5e-6  # $1.50 per 1M tokens
+
 class TokenTracker:
-    _instance = None
-    _lock = threading.Lock()
+    """Process-wide token accounting; use the module-level token_tracker instance"""
 
-    def __new__(cls):
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super(TokenTracker, cls).__new__(cls)
-                    cls._instance.reset()
-        return cls._instance
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
 
     def reset(self):
-        self.total_tokens = 0
-        self.prompt_tokens = 0
-        self.completion_tokens = 0
-        self.requests = 0
-        self.cost_estimate = 0.0
-        # Approximate costs per 1k tokens (example rates, adjust as needed)
-        self.rates = {
-            "input": 0.0005,  # $0.50 per 1M tokens
-            "output": 0.0015  # $1.50 per 1M tokens
-        }
+        # Held so a concurrent drain can't fold old records into the new totals
+        with self._lock:
+            self.total_tokens = 0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.requests = 0
+            self.cost_estimate = 0.0
+            # (prompt, completion, total, cost) per response; deque.append is
+            # thread-safe, so writers never wait on each other to record usage
+            self._pending = deque()
 
     def track_usage(self, usage_data: Dict[str, Any]):
         if not usage_data:
@@ -34,24 +34,44 @@ class TokenTracker:
         c_tokens = usage_data.get("completion_tokens", 0)
         total = usage_data.get("total_tokens", 0)
 
-        with self._lock:
+        # Calculate cost
+        cost = p_tokens * _INPUT_RATE_PER_TOKEN + c_tokens * _OUTPUT_RATE_PER_TOKEN
+        self._pending.append((p_tokens, c_tokens, total, cost))
+        self._try_drain()
+
+    def _try_drain(self):
+        """Fold pending records in unless another thread is already doing so"""
+        # A thread whose drain finished just before another thread appended
+        # sees the record here after releasing the lock, so none are left behind
+        while self._pending and self._lock.acquire(blocking=False):
+            try:
+                self._drain()
+            finally:
+                self._lock.release()
+
+    def _drain(self):
+        """Fold pending usage records into the totals; caller holds the lock"""
+        pending = self._pending
+        while pending:
+            p_tokens, c_tokens, total, cost = pending.popleft()
             self.prompt_tokens += p_tokens
             self.completion_tokens += c_tokens
             self.total_tokens += total
             self.requests += 1
-            
-            # Calculate cost
-            cost = (p_tokens / 1000 * self.rates["input"]) + (c_tokens / 1000 * self.rates["output"])
             self.cost_estimate += cost
 
     def get_stats(self) -> Dict[str, Any]:
         with self._lock:
-            return {
+            self._drain()
+            stats = {
                 "total_tokens": self.total_tokens,
                 "prompt_tokens": self.prompt_tokens,
                 "completion_tokens": self.completion_tokens,
                 "requests": self.requests,
                 "cost_estimate": round(self.cost_estimate, 6)
             }
+        # Records appended while the lock was held
+        self._try_drain()
+        return stats
 
 token_tracker = TokenTracker()
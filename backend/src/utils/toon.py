@@ -1,5 +1,38 @@
+import io
+import operator
 import re
-import json
+
+from src.utils import fast_json
+
+_TOON_BLOCK_RE = re.compile(r"```toon\n(.*?)\n```", re.DOTALL)
+_JSON_BLOCK_RE = re.compile(r"```json\n(.*?)\n```", re.DOTALL)
+
+# Key-value line; the key stops at the first colon
+_KV_RE = re.compile(r'([^:]*?)\s*:\s*(.*)')
+
+_BOOL_VALUES = {'true': True, 'false': False}
+
+# Numeric scalars; anything else stays a string without raising on conversion
+_INT_RE = re.compile(r'[-+]?\d+')
+_FLOAT_RE = re.compile(r'[-+]?(?:\d+\.\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+
+def _coerce(value: str):
+    """Convert a scalar TOON value to a bool, int or float when it looks like one"""
+    lowered = value.lower()
+    if lowered in _BOOL_VALUES:
+        return _BOOL_VALUES[lowered]
+    if _INT_RE.fullmatch(value):
+        return int(value)
+    if _FLOAT_RE.fullmatch(value):
+        return float(value)
+    return value
+
+
+def _parse_row(content: str, delimiter: str, headers: list) -> dict:
+    """Parse one table row into a dict keyed by the table headers"""
+    return dict(zip(headers, map(_coerce, map(str.strip, content.split(delimiter)))))
+
 
 def loads(text: str) -> dict:
     """
@@ -10,10 +43,14 @@ def loads(text: str) -> dict:
     - Nested objects: Indentation
     - Lists of objects: CSV-like table with header
     """
-    lines = text.strip().split('\n')
+    lines = text.splitlines()
     result = {}
     stack = [(result, -1)]  # (current_dict, indent_level)
+    # id() of each nested object -> (parent dict, key) it was created under,
+    # so placeholders can be replaced without scanning the parent
+    parent_ref = {}
     
+    current_list_parent = None
     current_list_key = None
     current_list_headers = []
     current_list_delimiter = ','
@@ -25,43 +62,23 @@ def loads(text: str) -> dict:
         if not line:
             continue
             
-        indent = len(line) - len(line.lstrip())
-        content = line.strip()
+        content = line.lstrip()
+        indent = len(line) - len(content)
         
         # Handle list mode (CSV-like)
         if in_list_mode:
             # Check if we are still in the list block (indentation check)
             if indent <= stack[-1][1]:
-                # End of list
-                target_dict = stack[-1][0]
-                # Fix: If the key exists in the parent (meaning the current dict was a placeholder),
-                # assign the list to the parent instead.
-                if len(stack) > 1 and current_list_key in stack[-2][0]:
-                    target_dict = stack[-2][0]
-                
-                target_dict[current_list_key] = current_list
+                # End of list: the list replaces its placeholder dict in the parent
+                current_list_parent[current_list_key] = current_list
                 in_list_mode = False
+                current_list_parent = None
                 current_list_key = None
                 current_list = []
                 current_list_headers = []
             else:
                 # Process list item
-                values = [v.strip() for v in content.split(current_list_delimiter)]
-                item = {}
-                for i, header in enumerate(current_list_headers):
-                    if i < len(values):
-                        val = values[i]
-                        # Try to convert to numbers/bools
-                        if val.lower() == 'true': val = True
-                        elif val.lower() == 'false': val = False
-                        else:
-                            try:
-                                if '.' in val: val = float(val)
-                                else: val = int(val)
-                            except ValueError:
-                                pass
-                        item[header] = val
-                current_list.append(item)
+                current_list.append(_parse_row(content, current_list_delimiter, current_list_headers))
                 continue
 
         # Adjust stack based on indentation
@@ -73,24 +90,16 @@ def loads(text: str) -> dict:
         # Check for simple list item "- value"
         if content.startswith('- '):
             value = content[2:].strip()
-            # print(f"DEBUG: Found list item '{value}' at indent {indent}")
             
             # Check if we need to convert an empty dict to a list
             # This happens when we parsed "key:" (creating a dict) and now see "- value"
             container = current_dict
             
             # If container is an empty dict, we might need to convert it
-            if isinstance(container, dict) and not container and len(stack) > 1:
-                 parent = stack[-2][0]
-                 # Find the key in parent that points to this container
-                 key_pointing_to_current = None
-                 for k, v in parent.items():
-                    if v is container:
-                        key_pointing_to_current = k
-                        break
+            if isinstance(container, dict) and not container and id(container) in parent_ref:
+                 parent, key_pointing_to_current = parent_ref.pop(id(container))
                  
-                 if key_pointing_to_current:
-                    # print(f"DEBUG: Converting key '{key_pointing_to_current}' to list")
+                 if parent.get(key_pointing_to_current) is container:
                     new_list = []
                     parent[key_pointing_to_current] = new_list
                     
@@ -103,7 +112,6 @@ def loads(text: str) -> dict:
 
             if isinstance(container, list):
                 container.append(value)
-                # print(f"DEBUG: Appended '{value}' to list")
             else:
                 # Fallback: if we are in a dict and it's not empty, maybe it's a mixed content?
                 # For now, let's assume valid TOON doesn't mix dict keys and list items in same block.
@@ -112,48 +120,30 @@ def loads(text: str) -> dict:
             continue
 
         # Check for key: value
-        if ':' in content:
-            key, value = content.split(':', 1)
-            key = key.strip()
-            value = value.strip()
+        match = _KV_RE.match(content)
+        if match:
+            key, value = match.groups()
             
             if not value:
                 # It's a nested object or a list start
                 new_obj = {}
                 current_dict[key] = new_obj
+                parent_ref[id(new_obj)] = (current_dict, key)
                 stack.append((new_obj, indent))
             elif value == '[]':
                 current_dict[key] = []
             else:
                 # Simple key-value
-                # Try to convert types
-                if value.lower() == 'true': value = True
-                elif value.lower() == 'false': value = False
-                else:
-                    try:
-                        if '.' in value: value = float(value)
-                        else: value = int(value)
-                    except ValueError:
-                        pass
-                current_dict[key] = value
+                current_dict[key] = _coerce(value)
         else:
             # No colon, likely a list header or list item if we were in a list
             # If we just started a block (previous line was key:), this might be headers
             if isinstance(stack[-1][0], dict) and not stack[-1][0]: # Empty dict we just created
-                # Convert that empty dict to a list placeholder
-                # We need to find the key for this... it's a bit tricky with the stack.
-                # Let's actually look at the parent
-                parent = stack[-2][0]
-                # Find the key that points to current_dict
-                # This is inefficient but works for now
-                key_for_this = None
-                for k, v in parent.items():
-                    if v is stack[-1][0]:
-                        key_for_this = k
-                        break
+                # The empty dict is a placeholder for a table under its key
+                ref = parent_ref.pop(id(stack[-1][0]), None)
                 
-                if key_for_this:
-                    current_list_key = key_for_this
+                if ref is not None:
+                    current_list_parent, current_list_key = ref
                     
                     # Detect delimiter
                     if '|' in content:
@@ -164,16 +154,11 @@ def loads(text: str) -> dict:
                     current_list_headers = [h.strip() for h in content.split(current_list_delimiter)]
                     current_list = []
                     in_list_mode = True
-                    # Remove the empty dict from parent
-                    # We will assign the list later
-                    pass
+                    # The list replaces the placeholder when the block ends
     
     # Cleanup if ended in list mode
     if in_list_mode and current_list_key:
-         target_dict = stack[-1][0]
-         if len(stack) > 1 and current_list_key in stack[-2][0]:
-             target_dict = stack[-2][0]
-         target_dict[current_list_key] = current_list
+         current_list_parent[current_list_key] = current_list
 
     return result
 
@@ -181,65 +166,89 @@ def dumps(data: dict, indent: int = 0) -> str:
     """
     Serializes a dictionary to TOON format.
     """
-    lines = []
+    buf = io.StringIO()
+    _write(buf, data, indent)
+    # Every line is written with a trailing newline; drop the last one
+    return buf.getvalue()[:-1]
+
+def _row_getter(headers: list):
+    """Return a callable that fetches an item's values for headers as a tuple"""
+    if not headers:
+        return lambda item: ()
+    if len(headers) == 1:
+        # itemgetter with one key returns the bare value, not a tuple
+        get_one = operator.itemgetter(headers[0])
+        return lambda item: (get_one(item),)
+    return operator.itemgetter(*headers)
+
+def _write(buf: io.StringIO, data: dict, indent: int) -> None:
+    """Write data to buf as TOON lines, each ending in a newline"""
     prefix = " " * indent
     
     for key, value in data.items():
         if isinstance(value, dict):
-            lines.append(f"{prefix}{key}:")
-            lines.append(dumps(value, indent + 2))
+            buf.write(f"{prefix}{key}:\n")
+            _write(buf, value, indent + 2)
         elif isinstance(value, list):
             if not value:
-                lines.append(f"{prefix}{key}: []")
+                buf.write(f"{prefix}{key}: []\n")
                 continue
             
             # Check if list of objects (dicts)
             if isinstance(value[0], dict):
-                lines.append(f"{prefix}{key}:")
                 headers = list(value[0].keys())
-                lines.append(f"{prefix}  " + ", ".join(headers))
+                buf.write(f"{prefix}{key}:\n{prefix}  {', '.join(headers)}\n")
+                getter = _row_getter(headers)
                 for item in value:
-                    row = []
-                    for h in headers:
-                        row.append(str(item.get(h, "")))
-                    lines.append(f"{prefix}  " + ", ".join(row))
+                    try:
+                        values = getter(item)
+                    except KeyError:
+                        # Rows missing a column fall back to blanks
+                        values = [item.get(h, "") for h in headers]
+                    buf.write(f"{prefix}  ")
+                    buf.write(", ".join(map(str, values)))
+                    buf.write("\n")
             else:
                 # List of primitives
-                lines.append(f"{prefix}{key}: " + ", ".join(map(str, value)))
+                buf.write(f"{prefix}{key}: {', '.join(map(str, value))}\n")
         else:
-            lines.append(f"{prefix}{key}: {value}")
-            
-    return "\n".join(lines)
+            buf.write(f"{prefix}{key}: {value}\n")
 
 def parse_response(text: str) -> dict:
     """
     Extracts and parses TOON content from an LLM response.
     Handles TOON blocks, JSON blocks, raw JSON, and raw TOON.
     """
-    if not text or not text.strip():
+    if not text:
+        return {}
+    stripped = text.lstrip()
+    if not stripped:
         return {}
 
-    # 1. Look for TOON code blocks
-    match = re.search(r"```toon\n(.*?)\n```", text, re.DOTALL)
-    if match:
+    # 1. Raw JSON; only worth trying when the text opens like JSON
+    if stripped[0] in '{[':
         try:
-            return loads(match.group(1))
+            return fast_json.loads(stripped)
         except Exception:
-            pass # Fallthrough
+            pass
 
-    # 2. Look for JSON code blocks
-    match = re.search(r"```json\n(.*?)\n```", text, re.DOTALL)
-    if match:
-        try:
-            return json.loads(match.group(1))
-        except Exception:
-            pass # Fallthrough
+    # 2. Look for TOON code blocks; the substring check skips the regex scan when absent
+    if '```toon' in text:
+        match = _TOON_BLOCK_RE.search(text)
+        if match:
+            try:
+                return loads(match.group(1))
+            except Exception:
+                pass # Fallthrough
 
-    # 3. Try parsing as raw JSON
-    try:
-        return json.loads(text)
-    except Exception:
-        pass
+    # 3. Look for JSON code blocks
+    if '```json' in text:
+        match = _JSON_BLOCK_RE.search(text)
+        if match:
+            try:
+                return fast_json.loads(match.group(1))
+            except Exception:
+                pass # Fallthrough
 
     # 4. Fallback: try to parse as TOON
     try:
@@ -17,8 +17,7 @@ def validate_toon_string(text: str) -> Tuple[Optional[Dict[str, Any]], Optional[
     try:
         # Try to find TOON block if embedded in markdown
         if "```toon" in text:
-            import re
-            match = re.search(r"```toon\n(.*?)\n```", text, re.DOTALL)
+            match = toon._TOON_BLOCK_RE.search(text)
             if match:
                 text = match.group(1)
         
@@ -8,6 +8,9 @@ from src.services.diagram.diagram import generate_mermaid_link
 # Add project root to path
 sys.path.append(os.getcwd())
 
+# Reuse connections (and TLS sessions) across requests
+session = requests.Session()
+
 def test_diagram_generation():
     summary_data = {
         "name": "TestProject",
@@ -33,7 +36,7 @@ def test_diagram_generation():
             
             # Check if URL is reachable
             try:
-                response = requests.get(url)
+                response = session.get(url)
                 print(f"URL Status Code: {response.status_code}")
                 if response.status_code == 200:
                     print("SUCCESS: Image is reachable")
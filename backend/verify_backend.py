@@ -4,9 +4,12 @@ import time
 
 BASE_URL = "http://localhost:8000"
 
+# One pooled connection for the health retries and the endpoint checks
+session = requests.Session()
+
 def test_health():
     try:
-        response = requests.get(f"{BASE_URL}/")
+        response = session.get(f"{BASE_URL}/")
         if response.status_code == 200:
             print("✅ Health check passed")
             return True
@@ -20,7 +23,7 @@ def test_health():
 def test_classify():
     try:
         payload = {"idea": "A fitness app for lazy developers"}
-        response = requests.post(f"{BASE_URL}/classify", json=payload)
+        response = session.post(f"{BASE_URL}/classify", json=payload)
         if response.status_code == 200:
             data = response.json()
             if "classification" in data:
@@ -39,11 +42,13 @@ def test_classify():
 
 if __name__ == "__main__":
     print("Waiting for API to start...")
-    # Simple retry logic to wait for API
-    for _ in range(5):
+    # Retry with exponential backoff so a fast startup is picked up quickly
+    delay = 0.1
+    for _ in range(8):
         if test_health():
             break
-        time.sleep(2)
+        time.sleep(delay)
+        delay = min(delay * 2, 3.2)
     else:
         print("Could not connect to API after retries.")
         sys.exit(1)